@@ -6,19 +6,20 @@ Handles backup operations, history, and status management
 
 import os
 import json
-import yaml
 import subprocess
-from datetime import datetime
 from typing import Dict, Any, List, Optional
 from .utils import (
     BACKUP_CONFIG_PATH,
     BACKUP_LOG_PATH,
     BACKUP_CLI_PATH,
     get_logger,
+    create_backup_timestamp,
     run_cli_command,
     parse_backup_output,
+    parse_cli_json,
     format_file_size,
     get_systemd_service_status,
+    read_last_lines,
     validate_file_path
 )
 from .config_manager import BackupConfigManager
@@ -33,41 +34,24 @@ class BackupHandler:
     def get_system_status(self) -> Dict[str, Any]:
         """Get backup system status and configuration"""
         try:
-            status = {
-                'system_status': 'unknown',
-                'config_exists': False,
-                'state_exists': False,
-                'service_status': 'unknown',
-                'last_backup': None,
-                'repositories_count': 0,
-                'cloud_providers': [],
-                'key_exists': False
-            }
+            # Collect the fields as locals and build the response dict once at the end
+            config_exists = os.path.exists(BACKUP_CONFIG_PATH)
+            state_exists = False
+            last_backup = None
+            repositories_count = 0
+            cloud_providers = []
             
-            # Check if config file exists
-            if os.path.exists(BACKUP_CONFIG_PATH):
-                status['config_exists'] = True
-                try:
-                    with open(BACKUP_CONFIG_PATH, 'r') as f:
-                        config = yaml.safe_load(f)
-                        status['repositories_count'] = len([r for r in config.get('repositories', []) if r.get('enabled', False)])
-                        status['cloud_providers'] = [name for name, provider in config.get('cloud_providers', {}).items() if provider.get('enabled', False)]
-                except Exception as e:
-                    self.logger.error(f"Failed to read config: {e}")
-            
-            # Check if state exists in config
+            # The settings file is JSON, so read it through the config manager's cached loader
             try:
                 config = self.config_manager.get_config()
+                repositories_count = sum(1 for r in config.get('repositories', []) if r.get('enabled', False))
+                cloud_providers = [name for name, provider in config.get('cloud_providers', {}).items() if provider.get('enabled', False)]
                 if 'state' in config:
-                    status['state_exists'] = True
-                    state = config['state']
+                    state_exists = True
                     # Use last_backup (includes all backup types) instead of just last_daily_backup
-                    status['last_backup'] = state.get('last_backup')
+                    last_backup = config['state'].get('last_backup')
             except Exception as e:
-                self.logger.error(f"Failed to read state: {e}")
-            
-            # Check systemd service status
-            status['service_status'] = get_systemd_service_status('homeserver-backup.timer')
+                self.logger.error(f"Failed to read config: {e}")
             
             # Check if backup key exists using sudo (same approach as backupTab2)
             key_path = "/vault/.keys/backup.key"
@@ -79,19 +63,31 @@ class BackupHandler:
                     text=True,
                     check=False
                 )
-                status['key_exists'] = result.returncode == 0
-                self.logger.info(f"Backup key existence check: {status['key_exists']} (return code: {result.returncode})")
+                key_exists = result.returncode == 0
+                self.logger.info(f"Backup key existence check: {key_exists} (return code: {result.returncode})")
             except Exception as e:
                 self.logger.warning(f"Failed to check backup key existence: {e}")
-                status['key_exists'] = False
+                key_exists = False
             
             # Determine overall system status
-            if status['config_exists'] and status['state_exists']:
-                status['system_status'] = 'configured'
-            elif status['config_exists']:
-                status['system_status'] = 'partial'
+            if config_exists and state_exists:
+                system_status = 'configured'
+            elif config_exists:
+                system_status = 'partial'
             else:
-                status['system_status'] = 'not_configured'
+                system_status = 'not_configured'
+            
+            status = {
+                'system_status': system_status,
+                'config_exists': config_exists,
+                'state_exists': state_exists,
+                # Check systemd service status
+                'service_status': get_systemd_service_status('homeserver-backup.timer'),
+                'last_backup': last_backup,
+                'repositories_count': repositories_count,
+                'cloud_providers': cloud_providers,
+                'key_exists': key_exists
+            }
             
             return status
         
@@ -122,7 +118,7 @@ class BackupHandler:
                 'repositories': repositories or [],
                 'output': stdout,
                 'parsed_output': parsed_output,
-                'completed_at': datetime.now().isoformat()
+                'completed_at': create_backup_timestamp()
             }
         
         except Exception as e:
@@ -146,14 +142,12 @@ class BackupHandler:
                 history['recent_backups'] = state.get('backup_history', [])[-10:]  # Last 10 backups
             
             # Read log file (last 50 lines)
-            if os.path.exists(BACKUP_LOG_PATH):
-                try:
-                    result = subprocess.run(['/usr/bin/tail', '-50', BACKUP_LOG_PATH], 
-                                          capture_output=True, text=True, timeout=10)
-                    if result.returncode == 0:
-                        history['log_entries'] = result.stdout.strip().split('\n')
-                except Exception as e:
-                    self.logger.error(f"Failed to read log file: {e}")
+            try:
+                history['log_entries'] = read_last_lines(BACKUP_LOG_PATH, 50)
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                self.logger.error(f"Failed to read log file: {e}")
             
             return history
         
@@ -169,27 +163,22 @@ class BackupHandler:
             
             # Run discovery command - use list-providers instead
             success, stdout, stderr = run_cli_command([
-                'python3', 'backup', 'list-providers'
+                'python3', 'backup', 'list-providers', '--format', 'json'
             ], timeout=30)
             
             if not success:
                 raise RuntimeError(f'Repository discovery failed: {stderr}')
             
-            # Parse output - convert providers to repository-like format
-            repositories = []
-            lines = stdout.strip().split('\n')
-            for line in lines:
-                if ' - ' in line and not line.startswith('Available providers:'):
-                    parts = line.split(' - ')
-                    if len(parts) >= 2:
-                        provider_name = parts[0].strip()
-                        status = parts[1].strip()
-                        repositories.append({
-                            'name': provider_name,
-                            'status': 'enabled' if 'enabled' in status else 'disabled',
-                            'type': 'provider',
-                            'path': f'/backup/{provider_name}'
-                        })
+            # Convert providers to repository-like format
+            repositories = [
+                {
+                    'name': provider['name'],
+                    'status': 'enabled' if provider['enabled'] else 'disabled',
+                    'type': 'provider',
+                    'path': f"/backup/{provider['name']}"
+                }
+                for provider in parse_cli_json(stdout)
+            ]
             
             return repositories
         
@@ -217,7 +206,7 @@ class BackupHandler:
                 'success': True,
                 'output': stdout,
                 'parsed_output': parse_backup_output(stdout),
-                'tested_at': datetime.now().isoformat()
+                'tested_at': create_backup_timestamp()
             }
         
         except Exception as e:
@@ -256,12 +245,11 @@ class BackupHandler:
                     stats['backup_success_rate'] = (successful / len(backup_history)) * 100
             
             # Get log file size if exists
-            if os.path.exists(BACKUP_LOG_PATH):
-                try:
-                    stat = os.stat(BACKUP_LOG_PATH)
-                    stats['log_file_size'] = format_file_size(stat.st_size)
-                except Exception:
-                    pass
+            try:
+                stat = os.stat(BACKUP_LOG_PATH)
+                stats['log_file_size'] = format_file_size(stat.st_size)
+            except OSError:
+                pass
             
             return stats
         
@@ -286,7 +274,7 @@ class BackupHandler:
                 'retention_days': retention_days,
                 'cleanup_started': True,
                 'message': 'Backup cleanup initiated',
-                'started_at': datetime.now().isoformat()
+                'started_at': create_backup_timestamp()
             }
         
         except Exception as e:
@@ -5,8 +5,10 @@ Handles all configuration operations for the backup system
 """
 
 import os
+import copy
 import json
 import yaml
+import threading
 from datetime import datetime
 from typing import Dict, Any, Optional
 from .utils import (
@@ -14,27 +16,485 @@ from .utils import (
     get_logger, 
     check_and_update_config, 
     redact_sensitive_fields,
-    validate_config_schema
+    compile_schema_pattern,
+    validate_config_schema,
+    write_file_atomically
 )
 
+# orjson is optional - fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared by every BackupConfigManager instance so concurrent writers cannot interleave
+_config_write_lock = threading.Lock()
+
+# Parsed config shared by every BackupConfigManager instance, reloaded when the file's (inode, size, mtime) changes
+_config_cache = {'key': None, 'raw': None, 'data': None}
+
+# Distinguishes "key absent" from a stored None when diffing updates
+_MISSING = object()
+
+# Summary counts, refreshed whenever the config is loaded or written
+_config_counts = {'enabled_providers': 0, 'backup_items': 0}
+
+def _parse_config(raw: bytes) -> Dict[str, Any]:
+    """Parse the settings file contents with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+def _serialize_config(config: Dict[str, Any]) -> bytes:
+    """Serialize a configuration as indented JSON bytes so it can be written in one call"""
+    if orjson is not None:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(config, indent=2).encode('utf-8')
+
+# Static provider metadata, built once at import rather than on every schema request
+_PROVIDER_SCHEMA = {
+    'local': {
+        'name': 'Local File System',
+        'description': 'Store backups on the local file system',
+        'status': 'available',
+        'config_fields': {
+            'enabled': {
+                'type': 'boolean',
+                'description': 'Enable or disable the local provider',
+                'default': False,
+                'required': False
+            },
+            'path': {
+                'type': 'string',
+                'description': 'Local directory path for storing backups',
+                'default': '/var/backups/homeserver',
+                'required': True,
+                'validation': {
+                    'pattern': '^/[a-zA-Z0-9_/.-]+$',
+                    'message': 'Must be a valid absolute path'
+                }
+            }
+        }
+    },
+    'backblaze': {
+        'name': 'Backblaze B2',
+        'description': 'Store backups on Backblaze B2 cloud storage',
+        'status': 'available',
+        'config_fields': {
+            'enabled': {
+                'type': 'boolean',
+                'description': 'Enable or disable the Backblaze provider',
+                'default': False,
+                'required': False
+            },
+            'application_key_id': {
+                'type': 'string',
+                'description': 'Backblaze B2 Application Key ID',
+                'default': '',
+                'required': True,
+                'validation': {
+                    'pattern': '^K[0-9a-zA-Z]{19}$',
+                    'message': 'Must be a valid Backblaze B2 Application Key ID (starts with K, 20 characters)'
+                }
+            },
+            'application_key': {
+                'type': 'string',
+                'description': 'Backblaze B2 Application Key',
+                'default': '',
+                'required': True,
+                'validation': {
+                    'pattern': '^K[0-9a-zA-Z]{31}$',
+                    'message': 'Must be a valid Backblaze B2 Application Key (starts with K, 32 characters)'
+                }
+            },
+            'container': {
+                'type': 'string',
+                'description': 'B2 bucket name for storing backups',
+                'default': 'homeserver-backups',
+                'required': True,
+                'validation': {
+                    'pattern': '^[a-zA-Z0-9-]{3,63}$',
+                    'message': 'Must be a valid B2 bucket name (3-63 characters, alphanumeric and hyphens)'
+                }
+            },
+            'container_type': {
+                'type': 'string',
+                'description': 'Container type (always bucket for B2)',
+                'default': 'bucket',
+                'required': False,
+                'readonly': True
+            },
+            'region': {
+                'type': 'string',
+                'description': 'B2 region identifier',
+                'default': 'us-west-000',
+                'required': False,
+                'options': ['us-west-000', 'us-west-001', 'us-west-002', 'us-east-000', 'us-east-001', 'eu-central-000']
+            },
+            'max_retries': {
+                'type': 'integer',
+                'description': 'Maximum number of retry attempts for failed operations',
+                'default': 3,
+                'required': False,
+                'validation': {
+                    'min': 1,
+                    'max': 10,
+                    'message': 'Must be between 1 and 10'
+                }
+            },
+            'retry_delay': {
+                'type': 'number',
+                'description': 'Initial delay between retry attempts in seconds',
+                'default': 1.0,
+                'required': False,
+                'validation': {
+                    'min': 0.1,
+                    'max': 60.0,
+                    'message': 'Must be between 0.1 and 60.0 seconds'
+                }
+            },
+            'timeout': {
+                'type': 'integer',
+                'description': 'Request timeout in seconds',
+                'default': 300,
+                'required': False,
+                'validation': {
+                    'min': 30,
+                    'max': 3600,
+                    'message': 'Must be between 30 and 3600 seconds'
+                }
+            },
+            'max_bandwidth': {
+                'type': 'integer',
+                'description': 'Maximum bandwidth in bytes per second (null for unlimited)',
+                'default': None,
+                'required': False,
+                'validation': {
+                    'min': 1024,
+                    'message': 'Must be at least 1024 bytes per second'
+                }
+            },
+            'upload_chunk_size': {
+                'type': 'integer',
+                'description': 'Upload chunk size in bytes for large files',
+                'default': 104857600,
+                'required': False,
+                'validation': {
+                    'min': 1048576,
+                    'max': 1073741824,
+                    'message': 'Must be between 1MB and 1GB'
+                }
+            },
+            'encryption_enabled': {
+                'type': 'boolean',
+                'description': 'Enable client-side encryption',
+                'default': False,
+                'required': False
+            },
+            'encryption_key': {
+                'type': 'string',
+                'description': 'Encryption key (auto-generated if not provided)',
+                'default': None,
+                'required': False
+            },
+            'encryption_salt': {
+                'type': 'string',
+                'description': 'Encryption salt (auto-generated if not provided)',
+                'default': None,
+                'required': False
+            },
+            'connection_pool_size': {
+                'type': 'integer',
+                'description': 'Maximum number of concurrent connections',
+                'default': 5,
+                'required': False,
+                'validation': {
+                    'min': 1,
+                    'max': 20,
+                    'message': 'Must be between 1 and 20'
+                }
+            },
+            'username': {
+                'type': 'string',
+                'description': 'Legacy field for compatibility (not used for B2)',
+                'default': '',
+                'required': False,
+                'deprecated': True
+            },
+            'password': {
+                'type': 'string',
+                'description': 'Legacy field for compatibility (not used for B2)',
+                'default': '',
+                'required': False,
+                'deprecated': True
+            }
+        }
+    },
+    'google_cloud_storage': {
+        'name': 'Google Cloud Storage',
+        'description': 'Store backups on Google Cloud Storage',
+        'status': 'future_development',
+        'config_fields': {
+            'enabled': {
+                'type': 'boolean',
+                'description': 'Enable or disable the Google Cloud Storage provider',
+                'default': False,
+                'required': False
+            },
+            'credentials_file': {
+                'type': 'string',
+                'description': 'Path to Google Cloud service account key JSON file',
+                'default': 'gcs_credentials.json',
+                'required': True,
+                'validation': {
+                    'pattern': '^[a-zA-Z0-9_/.-]+\\.json$',
+                    'message': 'Must be a valid JSON file path'
+                }
+            },
+            'container': {
+                'type': 'string',
+                'description': 'GCS bucket name for storing backups',
+                'default': 'homeserver-backups',
+                'required': True,
+                'validation': {
+                    'pattern': '^[a-zA-Z0-9][a-zA-Z0-9-]{2,61}[a-zA-Z0-9]$',
+                    'message': 'Must be a valid GCS bucket name'
+                }
+            },
+            'container_type': {
+                'type': 'string',
+                'description': 'Container type (always bucket for GCS)',
+                'default': 'bucket',
+                'required': False,
+                'readonly': True
+            },
+            'bucket_name': {
+                'type': 'string',
+                'description': 'GCS bucket name (alias for container)',
+                'default': 'homeserver-backups',
+                'required': True
+            },
+            'project_id': {
+                'type': 'string',
+                'description': 'Google Cloud project ID',
+                'default': '',
+                'required': True,
+                'validation': {
+                    'pattern': '^[a-z][a-z0-9-]{4,28}[a-z0-9]$',
+                    'message': 'Must be a valid Google Cloud project ID'
+                }
+            },
+            'max_retries': {
+                'type': 'integer',
+                'description': 'Maximum number of retry attempts',
+                'default': 3,
+                'required': False,
+                'validation': {
+                    'min': 1,
+                    'max': 10,
+                    'message': 'Must be between 1 and 10'
+                }
+            },
+            'retry_delay': {
+                'type': 'number',
+                'description': 'Initial delay between retry attempts in seconds',
+                'default': 1.0,
+                'required': False,
+                'validation': {
+                    'min': 0.1,
+                    'max': 60.0,
+                    'message': 'Must be between 0.1 and 60.0 seconds'
+                }
+            },
+            'timeout': {
+                'type': 'integer',
+                'description': 'Request timeout in seconds',
+                'default': 300,
+                'required': False,
+                'validation': {
+                    'min': 30,
+                    'max': 3600,
+                    'message': 'Must be between 30 and 3600 seconds'
+                }
+            },
+            'username': {
+                'type': 'string',
+                'description': 'Legacy field for compatibility (not used for GCS)',
+                'default': '',
+                'required': False,
+                'deprecated': True
+            },
+            'password': {
+                'type': 'string',
+                'description': 'Legacy field for compatibility (not used for GCS)',
+                'default': '',
+                'required': False,
+                'deprecated': True
+            }
+        }
+    }
+}
+
+# Static global settings metadata, built once at import like _PROVIDER_SCHEMA
+_GLOBAL_SCHEMA = {
+    'backup_items': {
+        'type': 'array',
+        'description': 'List of files and directories to backup',
+        'default': ['/tmp/test.txt'],
+        'required': True,
+        'validation': {
+            'min_items': 1,
+            'message': 'At least one backup item must be specified'
+        }
+    },
+    'retention_days': {
+        'type': 'integer',
+        'description': 'Number of days to retain backups',
+        'default': 30,
+        'required': False,
+        'validation': {
+            'min': 1,
+            'max': 3650,
+            'message': 'Must be between 1 and 3650 days'
+        }
+    },
+    'state': {
+        'type': 'object',
+        'description': 'Backup system state and tracking data',
+        'required': False,
+        'properties': {
+            'encryption_enabled': {
+                'type': 'boolean',
+                'description': 'Enable global encryption for backup packages',
+                'default': True
+            },
+            'backup_count': {
+                'type': 'integer',
+                'description': 'Total number of backups performed',
+                'default': 0
+            }
+        }
+    },
+    'logging': {
+        'type': 'object',
+        'description': 'Logging configuration',
+        'required': False,
+        'properties': {
+            'enabled': {
+                'type': 'boolean',
+                'description': 'Enable logging',
+                'default': True
+            },
+            'log_file': {
+                'type': 'string',
+                'description': 'Path to log file',
+                'default': '/var/log/homeserver/backup.log'
+            },
+            'log_level': {
+                'type': 'string',
+                'description': 'Logging level',
+                'default': 'INFO',
+                'options': ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+            },
+            'max_file_size_mb': {
+                'type': 'integer',
+                'description': 'Maximum log file size in MB',
+                'default': 10,
+                'validation': {
+                    'min': 1,
+                    'max': 1000,
+                    'message': 'Must be between 1 and 1000 MB'
+                }
+            },
+            'backup_count': {
+                'type': 'integer',
+                'description': 'Number of backup log files to keep',
+                'default': 5,
+                'validation': {
+                    'min': 1,
+                    'max': 50,
+                    'message': 'Must be between 1 and 50'
+                }
+            },
+            'format': {
+                'type': 'string',
+                'description': 'Log message format',
+                'default': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+            }
+        }
+    }
+}
+
+# Compiled validation regex and error message per (provider, field), built once at import
+_FIELD_PATTERNS = {
+    (provider_name, field_name): (
+        compile_schema_pattern(field['validation']['pattern']),
+        field['validation'].get('message', f"Field '{field_name}' format is invalid")
+    )
+    for provider_name, provider in _PROVIDER_SCHEMA.items()
+    for field_name, field in provider['config_fields'].items()
+    if 'pattern' in field.get('validation', {})
+}
+
 class BackupConfigManager:
     """Manages backup system configuration operations"""
     
     def __init__(self):
         self.logger = get_logger()
     
-    def get_config(self) -> Dict[str, Any]:
-        """Get the complete backup configuration"""
+    @property
+    def enabled_providers_count(self) -> int:
+        """Number of enabled providers in the last loaded configuration"""
+        return _config_counts['enabled_providers']
+    
+    @property
+    def backup_items_count(self) -> int:
+        """Number of backup items in the last loaded configuration"""
+        return _config_counts['backup_items']
+    
+    def _update_counts(self, config: Dict[str, Any]) -> None:
+        """Recompute the cached summary counts for a configuration"""
+        providers = config.get('providers') or {}
+        _config_counts['enabled_providers'] = sum(1 for provider in providers.values() if provider.get('enabled', False))
+        _config_counts['backup_items'] = len(config.get('backup_items') or [])
+    
+    def _load_cached_config(self) -> Optional[Dict[str, Any]]:
+        """Return the shared parsed config, reloading it only when the file changes (None if missing)"""
         try:
-            # Check and update configuration if needed
+            st = os.stat(BACKUP_CONFIG_PATH)
+        except FileNotFoundError:
+            return None
+        
+        # Atomic replaces give every write a new inode, so same-tick writes and mtime-preserving restores are caught too
+        if (st.st_ino, st.st_size, st.st_mtime_ns) != _config_cache['key']:
+            # Check and update configuration if needed (only when the file has changed)
             if not check_and_update_config():
                 self.logger.warning("Configuration update check failed, continuing with existing config")
             
-            if not os.path.exists(BACKUP_CONFIG_PATH):
+            with open(BACKUP_CONFIG_PATH, 'rb') as f:
+                raw = f.read()
+                # The update check may have rewritten the file, so record the identity of what was read
+                st = os.fstat(f.fileno())
+            
+            config = _parse_config(raw)
+            _config_cache['raw'] = raw
+            _config_cache['data'] = config
+            _config_cache['key'] = (st.st_ino, st.st_size, st.st_mtime_ns)
+            self._update_counts(config)
+        
+        return _config_cache['data']
+    
+    def get_config(self) -> Dict[str, Any]:
+        """Get the complete backup configuration"""
+        try:
+            if self._load_cached_config() is None:
                 return {}
             
-            with open(BACKUP_CONFIG_PATH, 'r') as f:
-                return json.load(f)
+            # Callers modify the returned config, so never hand out the cached object -
+            # re-parsing the cached bytes with orjson is cheaper than a deepcopy
+            if orjson is not None:
+                return orjson.loads(_config_cache['raw'])
+            return copy.deepcopy(_config_cache['data'])
         
         except Exception as e:
             self.logger.error(f"Failed to load configuration: {e}")
@@ -52,18 +512,17 @@ class BackupConfigManager:
             if not check_and_update_config():
                 self.logger.warning("Configuration update check failed, continuing with existing config")
             
-            if not os.path.exists(BACKUP_CONFIG_PATH):
-                return False
-            
-            # Load current config to compare changes
-            current_config = self.get_config()
-            
             # No need to create backups of the configuration file
             
-            # Write new config directly (www-data has write permissions)
-            with open(BACKUP_CONFIG_PATH, 'w') as f:
-                json.dump(new_config, f, indent=2)
+            # Replace the config file atomically (www-data has write permissions)
+            # The atomic write fails on a missing file instead of creating it, so no separate existence check is needed
+            try:
+                with _config_write_lock:
+                    write_file_atomically(BACKUP_CONFIG_PATH, _serialize_config(new_config))
+            except FileNotFoundError:
+                return False
             
+            self._update_counts(new_config)
             self.logger.info("Configuration updated successfully")
             return True
         
@@ -75,18 +534,29 @@ class BackupConfigManager:
     def get_provider_config(self, provider_name: str) -> Optional[Dict[str, Any]]:
         """Get configuration for a specific provider"""
         try:
-            config = self.get_config()
+            # Read from the shared cache and copy only the one provider section
+            config = self._load_cached_config() or {}
             providers = config.get('providers', {})
             
             if provider_name not in providers:
                 return None
             
-            return providers[provider_name].copy()
+            return copy.deepcopy(providers[provider_name])
         
         except Exception as e:
             self.logger.error(f"Failed to get provider config for {provider_name}: {e}")
             return None
     
+    def get_schedule_config(self) -> Dict[str, Any]:
+        """Get the stored schedule section without copying the rest of the configuration"""
+        try:
+            config = self._load_cached_config() or {}
+            return dict(config.get('schedule') or {})
+        
+        except Exception as e:
+            self.logger.error(f"Failed to get schedule config: {e}")
+            return {}
+    
     def get_safe_provider_config(self, provider_name: str) -> Optional[Dict[str, Any]]:
         """Get provider configuration with sensitive fields redacted"""
         config = self.get_provider_config(provider_name)
@@ -101,27 +571,33 @@ class BackupConfigManager:
             if not check_and_update_config():
                 self.logger.warning("Configuration update check failed, continuing with existing config")
             
-            if not os.path.exists(BACKUP_CONFIG_PATH):
-                return False
-            
-            # Load current config
-            config = self.get_config()
-            
-            # Validate provider exists
-            if 'providers' not in config:
-                config['providers'] = {}
-            
-            if provider_name not in config['providers']:
-                return False
-            
-            # No need to create backups of the configuration file
-            
-            # Update provider config
-            config['providers'][provider_name].update(updates)
-            
-            # Write updated config directly (www-data has write permissions)
-            with open(BACKUP_CONFIG_PATH, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Hold the lock across read-modify-write so concurrent updates are not lost
+            with _config_write_lock:
+                # Load current config (empty when the file does not exist)
+                config = self.get_config()
+                if not config:
+                    return False
+                
+                # Validate provider exists
+                if 'providers' not in config:
+                    config['providers'] = {}
+                
+                if provider_name not in config['providers']:
+                    return False
+                
+                # No need to create backups of the configuration file
+                
+                # Only rewrite the file when something actually changes
+                existing = config['providers'][provider_name]
+                changed = {key: value for key, value in updates.items() if existing.get(key, _MISSING) != value}
+                if not changed:
+                    return True
+                
+                # Update provider config
+                existing.update(changed)
+                
+                # Replace the config file atomically (www-data has write permissions)
+                write_file_atomically(BACKUP_CONFIG_PATH, _serialize_config(config))
             
             self.logger.info(f"Provider configuration updated for {provider_name}")
             return True
@@ -130,290 +606,22 @@ class BackupConfigManager:
             self.logger.error(f"Failed to update provider config for {provider_name}: {e}")
             return False
     
+    def validate_provider_fields(self, provider_name: str, updates: Dict[str, Any]) -> tuple[bool, list]:
+        """Check submitted provider fields against the precompiled schema patterns (empty values are not checked)"""
+        errors = []
+        for field_name, value in updates.items():
+            entry = _FIELD_PATTERNS.get((provider_name, field_name))
+            if entry is not None and isinstance(value, str) and value and not entry[0].match(value):
+                errors.append(entry[1])
+        return len(errors) == 0, errors
+    
     def get_provider_schema(self) -> Dict[str, Any]:
-        """Get comprehensive provider configuration schema"""
-        return {
-            'local': {
-                'name': 'Local File System',
-                'description': 'Store backups on the local file system',
-                'status': 'available',
-                'config_fields': {
-                    'enabled': {
-                        'type': 'boolean',
-                        'description': 'Enable or disable the local provider',
-                        'default': False,
-                        'required': False
-                    },
-                    'path': {
-                        'type': 'string',
-                        'description': 'Local directory path for storing backups',
-                        'default': '/var/backups/homeserver',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^/[a-zA-Z0-9_/.-]+$',
-                            'message': 'Must be a valid absolute path'
-                        }
-                    }
-                }
-            },
-            'backblaze': {
-                'name': 'Backblaze B2',
-                'description': 'Store backups on Backblaze B2 cloud storage',
-                'status': 'available',
-                'config_fields': {
-                    'enabled': {
-                        'type': 'boolean',
-                        'description': 'Enable or disable the Backblaze provider',
-                        'default': False,
-                        'required': False
-                    },
-                    'application_key_id': {
-                        'type': 'string',
-                        'description': 'Backblaze B2 Application Key ID',
-                        'default': '',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^K[0-9a-zA-Z]{19}$',
-                            'message': 'Must be a valid Backblaze B2 Application Key ID (starts with K, 20 characters)'
-                        }
-                    },
-                    'application_key': {
-                        'type': 'string',
-                        'description': 'Backblaze B2 Application Key',
-                        'default': '',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^K[0-9a-zA-Z]{31}$',
-                            'message': 'Must be a valid Backblaze B2 Application Key (starts with K, 32 characters)'
-                        }
-                    },
-                    'container': {
-                        'type': 'string',
-                        'description': 'B2 bucket name for storing backups',
-                        'default': 'homeserver-backups',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^[a-zA-Z0-9-]{3,63}$',
-                            'message': 'Must be a valid B2 bucket name (3-63 characters, alphanumeric and hyphens)'
-                        }
-                    },
-                    'container_type': {
-                        'type': 'string',
-                        'description': 'Container type (always bucket for B2)',
-                        'default': 'bucket',
-                        'required': False,
-                        'readonly': True
-                    },
-                    'region': {
-                        'type': 'string',
-                        'description': 'B2 region identifier',
-                        'default': 'us-west-000',
-                        'required': False,
-                        'options': ['us-west-000', 'us-west-001', 'us-west-002', 'us-east-000', 'us-east-001', 'eu-central-000']
-                    },
-                    'max_retries': {
-                        'type': 'integer',
-                        'description': 'Maximum number of retry attempts for failed operations',
-                        'default': 3,
-                        'required': False,
-                        'validation': {
-                            'min': 1,
-                            'max': 10,
-                            'message': 'Must be between 1 and 10'
-                        }
-                    },
-                    'retry_delay': {
-                        'type': 'number',
-                        'description': 'Initial delay between retry attempts in seconds',
-                        'default': 1.0,
-                        'required': False,
-                        'validation': {
-                            'min': 0.1,
-                            'max': 60.0,
-                            'message': 'Must be between 0.1 and 60.0 seconds'
-                        }
-                    },
-                    'timeout': {
-                        'type': 'integer',
-                        'description': 'Request timeout in seconds',
-                        'default': 300,
-                        'required': False,
-                        'validation': {
-                            'min': 30,
-                            'max': 3600,
-                            'message': 'Must be between 30 and 3600 seconds'
-                        }
-                    },
-                    'max_bandwidth': {
-                        'type': 'integer',
-                        'description': 'Maximum bandwidth in bytes per second (null for unlimited)',
-                        'default': None,
-                        'required': False,
-                        'validation': {
-                            'min': 1024,
-                            'message': 'Must be at least 1024 bytes per second'
-                        }
-                    },
-                    'upload_chunk_size': {
-                        'type': 'integer',
-                        'description': 'Upload chunk size in bytes for large files',
-                        'default': 104857600,
-                        'required': False,
-                        'validation': {
-                            'min': 1048576,
-                            'max': 1073741824,
-                            'message': 'Must be between 1MB and 1GB'
-                        }
-                    },
-                    'encryption_enabled': {
-                        'type': 'boolean',
-                        'description': 'Enable client-side encryption',
-                        'default': False,
-                        'required': False
-                    },
-                    'encryption_key': {
-                        'type': 'string',
-                        'description': 'Encryption key (auto-generated if not provided)',
-                        'default': None,
-                        'required': False
-                    },
-                    'encryption_salt': {
-                        'type': 'string',
-                        'description': 'Encryption salt (auto-generated if not provided)',
-                        'default': None,
-                        'required': False
-                    },
-                    'connection_pool_size': {
-                        'type': 'integer',
-                        'description': 'Maximum number of concurrent connections',
-                        'default': 5,
-                        'required': False,
-                        'validation': {
-                            'min': 1,
-                            'max': 20,
-                            'message': 'Must be between 1 and 20'
-                        }
-                    },
-                    'username': {
-                        'type': 'string',
-                        'description': 'Legacy field for compatibility (not used for B2)',
-                        'default': '',
-                        'required': False,
-                        'deprecated': True
-                    },
-                    'password': {
-                        'type': 'string',
-                        'description': 'Legacy field for compatibility (not used for B2)',
-                        'default': '',
-                        'required': False,
-                        'deprecated': True
-                    }
-                }
-            },
-            'google_cloud_storage': {
-                'name': 'Google Cloud Storage',
-                'description': 'Store backups on Google Cloud Storage',
-                'status': 'future_development',
-                'config_fields': {
-                    'enabled': {
-                        'type': 'boolean',
-                        'description': 'Enable or disable the Google Cloud Storage provider',
-                        'default': False,
-                        'required': False
-                    },
-                    'credentials_file': {
-                        'type': 'string',
-                        'description': 'Path to Google Cloud service account key JSON file',
-                        'default': 'gcs_credentials.json',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^[a-zA-Z0-9_/.-]+\\.json$',
-                            'message': 'Must be a valid JSON file path'
-                        }
-                    },
-                    'container': {
-                        'type': 'string',
-                        'description': 'GCS bucket name for storing backups',
-                        'default': 'homeserver-backups',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^[a-zA-Z0-9][a-zA-Z0-9-]{2,61}[a-zA-Z0-9]$',
-                            'message': 'Must be a valid GCS bucket name'
-                        }
-                    },
-                    'container_type': {
-                        'type': 'string',
-                        'description': 'Container type (always bucket for GCS)',
-                        'default': 'bucket',
-                        'required': False,
-                        'readonly': True
-                    },
-                    'bucket_name': {
-                        'type': 'string',
-                        'description': 'GCS bucket name (alias for container)',
-                        'default': 'homeserver-backups',
-                        'required': True
-                    },
-                    'project_id': {
-                        'type': 'string',
-                        'description': 'Google Cloud project ID',
-                        'default': '',
-                        'required': True,
-                        'validation': {
-                            'pattern': '^[a-z][a-z0-9-]{4,28}[a-z0-9]$',
-                            'message': 'Must be a valid Google Cloud project ID'
-                        }
-                    },
-                    'max_retries': {
-                        'type': 'integer',
-                        'description': 'Maximum number of retry attempts',
-                        'default': 3,
-                        'required': False,
-                        'validation': {
-                            'min': 1,
-                            'max': 10,
-                            'message': 'Must be between 1 and 10'
-                        }
-                    },
-                    'retry_delay': {
-                        'type': 'number',
-                        'description': 'Initial delay between retry attempts in seconds',
-                        'default': 1.0,
-                        'required': False,
-                        'validation': {
-                            'min': 0.1,
-                            'max': 60.0,
-                            'message': 'Must be between 0.1 and 60.0 seconds'
-                        }
-                    },
-                    'timeout': {
-                        'type': 'integer',
-                        'description': 'Request timeout in seconds',
-                        'default': 300,
-                        'required': False,
-                        'validation': {
-                            'min': 30,
-                            'max': 3600,
-                            'message': 'Must be between 30 and 3600 seconds'
-                        }
-                    },
-                    'username': {
-                        'type': 'string',
-                        'description': 'Legacy field for compatibility (not used for GCS)',
-                        'default': '',
-                        'required': False,
-                        'deprecated': True
-                    },
-                    'password': {
-                        'type': 'string',
-                        'description': 'Legacy field for compatibility (not used for GCS)',
-                        'default': '',
-                        'required': False,
-                        'deprecated': True
-                    }
-                }
-            }
-        }
+        """Get comprehensive provider configuration schema (shared module constant - do not modify)"""
+        return _PROVIDER_SCHEMA
+    
+    def is_known_provider(self, provider_name: str) -> bool:
+        """Check whether a provider name exists in the provider schema"""
+        return provider_name in _PROVIDER_SCHEMA
     
     def increment_backup_count(self) -> bool:
         """Increment the backup count in the configuration file."""
@@ -422,24 +630,24 @@ class BackupConfigManager:
             if not check_and_update_config():
                 self.logger.warning("Configuration update check failed, continuing with existing config")
             
-            if not os.path.exists(BACKUP_CONFIG_PATH):
-                self.logger.error("Configuration file not found")
-                return False
-            
-            # Load current config
-            config = self.get_config()
-            
-            # Initialize state section if it doesn't exist
-            if 'state' not in config:
-                config['state'] = {}
-            
-            # Increment backup count in state section
-            current_count = config['state'].get('backup_count', 0)
-            config['state']['backup_count'] = current_count + 1
-            
-            # Write updated config directly (www-data has write permissions)
-            with open(BACKUP_CONFIG_PATH, 'w') as f:
-                json.dump(config, f, indent=2)
+            # Hold the lock across read-modify-write so concurrent increments are not lost
+            with _config_write_lock:
+                # Load current config (empty when the file does not exist)
+                config = self.get_config()
+                if not config:
+                    self.logger.error("Configuration file not found")
+                    return False
+                
+                # Initialize state section if it doesn't exist
+                if 'state' not in config:
+                    config['state'] = {}
+                
+                # Increment backup count in state section
+                current_count = config['state'].get('backup_count', 0)
+                config['state']['backup_count'] = current_count + 1
+                
+                # Replace the config file atomically (www-data has write permissions)
+                write_file_atomically(BACKUP_CONFIG_PATH, _serialize_config(config))
             
             self.logger.info(f"Backup count incremented to {config['state']['backup_count']}")
             return True
@@ -449,92 +657,5 @@ class BackupConfigManager:
             return False
     
     def get_global_schema(self) -> Dict[str, Any]:
-        """Get global configuration schema"""
-        return {
-            'backup_items': {
-                'type': 'array',
-                'description': 'List of files and directories to backup',
-                'default': ['/tmp/test.txt'],
-                'required': True,
-                'validation': {
-                    'min_items': 1,
-                    'message': 'At least one backup item must be specified'
-                }
-            },
-            'retention_days': {
-                'type': 'integer',
-                'description': 'Number of days to retain backups',
-                'default': 30,
-                'required': False,
-                'validation': {
-                    'min': 1,
-                    'max': 3650,
-                    'message': 'Must be between 1 and 3650 days'
-                }
-            },
-            'state': {
-                'type': 'object',
-                'description': 'Backup system state and tracking data',
-                'required': False,
-                'properties': {
-                    'encryption_enabled': {
-                        'type': 'boolean',
-                        'description': 'Enable global encryption for backup packages',
-                        'default': True
-                    },
-                    'backup_count': {
-                        'type': 'integer',
-                        'description': 'Total number of backups performed',
-                        'default': 0
-                    }
-                }
-            },
-            'logging': {
-                'type': 'object',
-                'description': 'Logging configuration',
-                'required': False,
-                'properties': {
-                    'enabled': {
-                        'type': 'boolean',
-                        'description': 'Enable logging',
-                        'default': True
-                    },
-                    'log_file': {
-                        'type': 'string',
-                        'description': 'Path to log file',
-                        'default': '/var/log/homeserver/backup.log'
-                    },
-                    'log_level': {
-                        'type': 'string',
-                        'description': 'Logging level',
-                        'default': 'INFO',
-                        'options': ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
-                    },
-                    'max_file_size_mb': {
-                        'type': 'integer',
-                        'description': 'Maximum log file size in MB',
-                        'default': 10,
-                        'validation': {
-                            'min': 1,
-                            'max': 1000,
-                            'message': 'Must be between 1 and 1000 MB'
-                        }
-                    },
-                    'backup_count': {
-                        'type': 'integer',
-                        'description': 'Number of backup log files to keep',
-                        'default': 5,
-                        'validation': {
-                            'min': 1,
-                            'max': 50,
-                            'message': 'Must be between 1 and 50'
-                        }
-                    },
-                    'format': {
-                        'type': 'string',
-                        'description': 'Log message format',
-                        'default': '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-                    }
-                }
-            }
-        }
+        """Get global configuration schema (shared module constant - do not modify)"""
+        return _GLOBAL_SCHEMA
@@ -10,12 +10,37 @@ from .utils import (
     BACKUP_CLI_PATH,
     get_logger,
     run_cli_command,
+    run_cli_command_until,
     get_provider_status_from_output,
+    parse_cli_json,
     validate_file_path,
     validate_config_schema
 )
 from .config_manager import BackupConfigManager
 
+# Static reference tables returned alongside the provider schema
+_SCHEMA_REFERENCE = {
+    'provider_status_legend': {
+        'available': 'Fully functional and ready to use',
+        'future_development': 'Planned for future releases, currently disabled'
+    },
+    'field_types': {
+        'boolean': 'True/false value',
+        'string': 'Text value',
+        'integer': 'Whole number',
+        'number': 'Decimal number',
+        'array': 'List of values',
+        'object': 'Nested configuration object'
+    },
+    'validation_types': {
+        'pattern': 'Regular expression validation',
+        'min': 'Minimum value',
+        'max': 'Maximum value',
+        'min_items': 'Minimum number of items in array',
+        'options': 'List of allowed values'
+    }
+}
+
 class ProviderHandler:
     """Handles provider-specific operations"""
     
@@ -26,31 +51,11 @@ class ProviderHandler:
     def get_provider_schema(self) -> Dict[str, Any]:
         """Get comprehensive provider configuration schema for all available providers"""
         try:
-            provider_schema = self.config_manager.get_provider_schema()
-            global_schema = self.config_manager.get_global_schema()
-            
+            # Every part is a module-level constant, so only the small envelope dict is allocated
             return {
-                'providers': provider_schema,
-                'global_config': global_schema,
-                'provider_status_legend': {
-                    'available': 'Fully functional and ready to use',
-                    'future_development': 'Planned for future releases, currently disabled'
-                },
-                'field_types': {
-                    'boolean': 'True/false value',
-                    'string': 'Text value',
-                    'integer': 'Whole number',
-                    'number': 'Decimal number',
-                    'array': 'List of values',
-                    'object': 'Nested configuration object'
-                },
-                'validation_types': {
-                    'pattern': 'Regular expression validation',
-                    'min': 'Minimum value',
-                    'max': 'Maximum value',
-                    'min_items': 'Minimum number of items in array',
-                    'options': 'List of allowed values'
-                }
+                'providers': self.config_manager.get_provider_schema(),
+                'global_config': self.config_manager.get_global_schema(),
+                **_SCHEMA_REFERENCE
             }
         
         except Exception as e:
@@ -83,6 +88,10 @@ class ProviderHandler:
             if not validate_file_path(BACKUP_CLI_PATH):
                 raise FileNotFoundError("Backup CLI not installed")
             
+            is_valid, errors = self.config_manager.validate_provider_fields(provider_name, updates)
+            if not is_valid:
+                raise ValueError(f"Invalid configuration for provider {provider_name}: {'; '.join(errors)}")
+            
             success = self.config_manager.update_provider_config(provider_name, updates)
             if not success:
                 raise ValueError(f"Failed to update configuration for provider {provider_name}")
@@ -90,7 +99,7 @@ class ProviderHandler:
             return {
                 'message': f'Configuration updated for provider {provider_name}',
                 'provider_name': provider_name,
-                'updated_fields': list(updates.keys())
+                'updated_fields': tuple(updates)
             }
         
         except Exception as e:
@@ -103,10 +112,12 @@ class ProviderHandler:
             if not validate_file_path(BACKUP_CLI_PATH):
                 raise FileNotFoundError("Backup CLI not installed")
             
-            # Run provider-specific connection test
-            success, stdout, stderr = run_cli_command([
-                'python3', 'backup', 'test-providers'
-            ], timeout=60)
+            # Run the connection tests, stopping the CLI as soon as this provider's result line appears
+            success, stdout, stderr = run_cli_command_until(
+                ['python3', 'backup', 'test-providers'],
+                lambda line: get_provider_status_from_output(line, provider_name) is not None,
+                timeout=60
+            )
             
             # Parse results to find specific provider
             provider_result = get_provider_status_from_output(stdout, provider_name)
@@ -130,27 +141,22 @@ class ProviderHandler:
             
             # Run discovery command - use list-providers instead
             success, stdout, stderr = run_cli_command([
-                'python3', 'backup', 'list-providers'
+                'python3', 'backup', 'list-providers', '--format', 'json'
             ], timeout=30)
             
             if not success:
                 raise RuntimeError(f'Provider discovery failed: {stderr}')
             
-            # Parse output - convert providers to repository-like format
-            repositories = []
-            lines = stdout.strip().split('\n')
-            for line in lines:
-                if ' - ' in line and not line.startswith('Available providers:'):
-                    parts = line.split(' - ')
-                    if len(parts) >= 2:
-                        provider_name = parts[0].strip()
-                        status = parts[1].strip()
-                        repositories.append({
-                            'name': provider_name,
-                            'status': 'enabled' if 'enabled' in status else 'disabled',
-                            'type': 'provider',
-                            'path': f'/backup/{provider_name}'
-                        })
+            # Convert providers to repository-like format
+            repositories = [
+                {
+                    'name': provider['name'],
+                    'status': 'enabled' if provider['enabled'] else 'disabled',
+                    'type': 'provider',
+                    'path': f"/backup/{provider['name']}"
+                }
+                for provider in parse_cli_json(stdout)
+            ]
             
             return repositories
         
@@ -166,25 +172,14 @@ class ProviderHandler:
             
             # Run connection test
             success, stdout, stderr = run_cli_command([
-                'python3', 'backup', 'test-providers'
+                'python3', 'backup', 'test-providers', '--format', 'json'
             ], timeout=60)
             
             if not success:
                 raise RuntimeError(f'Provider test failed: {stderr}')
             
-            # Parse results (simplified)
-            connections = {}
-            lines = stdout.strip().split('\n')
-            for line in lines:
-                if '✓' in line or '✗' in line:
-                    if '✓' in line:
-                        provider = line.split('✓')[1].strip()
-                        connections[provider] = True
-                    elif '✗' in line:
-                        provider = line.split('✗')[1].strip()
-                        connections[provider] = False
-            
-            return connections
+            # Provider name -> connection result
+            return parse_cli_json(stdout)
         
         except Exception as e:
             self.logger.error(f"Cloud connection test failed: {e}")
@@ -5,17 +5,29 @@ Professional backup system API endpoints - Refactored version
 """
 
 import os
+import json
+import time
+import uuid
+import hashlib
+import tempfile
+import threading
 import subprocess
 import eventlet
 from datetime import datetime
-from flask import Blueprint, request, jsonify, current_app, copy_current_request_context
-from .utils import get_logger, create_backup_timestamp
+from flask import Blueprint, request, jsonify, make_response, current_app, copy_current_request_context, stream_with_context, g
+from .utils import BACKUP_LOG_PATH, get_logger, create_backup_timestamp, iter_last_lines
 from .config_manager import BackupConfigManager
 from .provider_handlers import ProviderHandler
 from .backup_handlers import BackupHandler
 from .schedule_handlers import ScheduleHandler
 from .src.backup_manager import BackupManager
 
+# orjson is optional - fall back to Flask's jsonify when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Create blueprint
 bp = Blueprint('backup', __name__, url_prefix='/api/backup')
 
@@ -28,11 +40,38 @@ schedule_handler = ScheduleHandler()
 _config_path = "/var/www/homeserver/premium/backupTab_settings.json"
 backup_manager = BackupManager(_config_path)
 
+# Bind shared references once instead of resolving them on every request
+logger = get_logger()
+_keyman = backup_manager.keyman
+
+# Changes on every restart so ETags are invalidated when a deploy changes the schemas
+_ETAG_SALT = str(time.time_ns())
+
+# Computations currently in progress, keyed by name (see _single_flight)
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+# Backup jobs started by /backup/run, keyed by job id (oldest finished ones are pruned)
+_MAX_BACKUP_JOBS = 50
+_backup_jobs = {}
+
+# Upper bound for /history/log?lines=N
+_MAX_LOG_LINES = 5000
+
+@bp.before_request
+def _stamp_request():
+    """Take the wall-clock timestamp once per request and reuse it for everything the request reports"""
+    g.request_timestamp = create_backup_timestamp()
+
+def _request_timestamp() -> str:
+    """Timestamp of the current request (falls back to now outside a blueprint request)"""
+    return g.get('request_timestamp') or create_backup_timestamp()
+
 def create_response(success: bool, data: dict = None, error: str = None, status_code: int = 200):
     """Create standardized API response"""
     response_data = {
         'success': success,
-        'timestamp': create_backup_timestamp()
+        'timestamp': _request_timestamp()
     }
     
     if success:
@@ -42,7 +81,111 @@ def create_response(success: bool, data: dict = None, error: str = None, status_
         if error:
             response_data['error'] = error
     
-    return jsonify(response_data), status_code if not success else 200
+    status = status_code
+    
+    if orjson is not None:
+        return current_app.response_class(
+            orjson.dumps(response_data, option=orjson.OPT_NON_STR_KEYS),
+            status=status,
+            mimetype='application/json'
+        )
+    
+    return jsonify(response_data), status
+
+def _dumps(data) -> bytes:
+    """Serialize data to JSON bytes with orjson when available"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data).encode('utf-8')
+
+def _make_etag(*parts: str) -> str:
+    """Build a quoted ETag from the process salt and the given parts"""
+    digest = hashlib.blake2b(':'.join((_ETAG_SALT,) + parts).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+def _config_etag() -> str:
+    """ETag that changes whenever the config file is modified"""
+    try:
+        st = os.stat(_config_path)
+        identity = f'{st.st_ino}:{st.st_size}:{st.st_mtime_ns}'
+    except OSError:
+        identity = '0'
+    return _make_etag('config', identity)
+
+def _content_etag(data) -> str:
+    """ETag derived from the data itself, for responses that are not backed by a single file"""
+    if orjson is not None:
+        body = orjson.dumps(data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+    else:
+        body = json.dumps(data, sort_keys=True, default=str).encode()
+    return _make_etag('content', hashlib.blake2b(body, digest_size=8).hexdigest())
+
+def create_cached_response(etag: str, build_data):
+    """Return 304 if the client already has this ETag, otherwise build the data and tag the response"""
+    if request.headers.get('If-None-Match') == etag:
+        return current_app.response_class(status=304, headers={'ETag': etag})
+    
+    response = make_response(create_response(True, build_data()))
+    response.headers['ETag'] = etag
+    return response
+
+# Static response bodies are serialized once with this placeholder standing in for the timestamp
+_STATIC_TIMESTAMP_PLACEHOLDER = '__STATIC_TIMESTAMP__'
+_SERIALIZED_TIMESTAMP_PLACEHOLDER = _dumps(_STATIC_TIMESTAMP_PLACEHOLDER)
+
+def _prebuild_body(data) -> bytes:
+    """Serialize a success response around static data, leaving a placeholder for the timestamp"""
+    return _dumps({
+        'success': True,
+        'timestamp': _STATIC_TIMESTAMP_PLACEHOLDER,
+        'data': data
+    })
+
+def create_static_response(etag: str, body: bytes):
+    """Return 304 if the client already has this ETag, otherwise splice the timestamp into a prebuilt body"""
+    if request.headers.get('If-None-Match') == etag:
+        return current_app.response_class(status=304, headers={'ETag': etag})
+    
+    # Only the timestamp differs between responses, so nothing else is re-serialized
+    timestamp = _dumps(_request_timestamp())
+    body = body.replace(_SERIALIZED_TIMESTAMP_PLACEHOLDER, timestamp, 1)
+    return current_app.response_class(body, mimetype='application/json', headers={'ETag': etag})
+
+def _single_flight(key: str, compute):
+    """Run compute() once for all concurrent callers using the same key and share its result"""
+    with _inflight_lock:
+        entry = _inflight.get(key)
+        is_leader = entry is None
+        if is_leader:
+            entry = {'event': threading.Event(), 'result': None, 'error': None}
+            _inflight[key] = entry
+    
+    if not is_leader:
+        entry['event'].wait()
+        if entry['error'] is not None:
+            raise entry['error']
+        return entry['result']
+    
+    try:
+        entry['result'] = compute()
+        return entry['result']
+    except Exception as e:
+        entry['error'] = e
+        raise
+    finally:
+        with _inflight_lock:
+            _inflight.pop(key, None)
+        entry['event'].set()
+
+def _get_json_body(*required_fields: str):
+    """Parse the JSON request body once, returning None if it is missing, malformed or incomplete"""
+    data = request.get_json(silent=True)
+    if not data or not isinstance(data, dict):
+        return None
+    for field in required_fields:
+        if field not in data:
+            return None
+    return data
 
 def _get_provider_description(provider_name: str) -> str:
     """Get human-readable description for provider"""
@@ -83,70 +226,63 @@ def _is_provider_available(provider_name: str) -> bool:
 
 def _is_provider_configured(provider_name: str, provider_config: dict) -> bool:
     """Check if provider has required credentials configured"""
-    get_logger().info(f"Checking if provider '{provider_name}' is configured")
-    get_logger().info(f"Provider config: {provider_config}")
+    logger.info(f"Checking if provider '{provider_name}' is configured")
+    logger.info(f"Provider config: {provider_config}")
     
     # Only allow the providers we want
     allowed_providers = ['local', 'backblaze', 'aws_s3', 'google_cloud_storage']
     if provider_name not in allowed_providers:
-        get_logger().warning(f"Provider '{provider_name}' not in allowed providers: {allowed_providers}")
+        logger.warning(f"Provider '{provider_name}' not in allowed providers: {allowed_providers}")
         return False
     
     if provider_name == 'local':
         # Local provider is always configured - it doesn't need credentials
-        get_logger().info("Local provider is always configured")
+        logger.info("Local provider is always configured")
         return True
     
     elif provider_name == 'backblaze':
-        get_logger().info("Checking Backblaze provider configuration")
+        logger.info("Checking Backblaze provider configuration")
         # Check if keyman integration is enabled
         keyman_integrated = provider_config.get('keyman_integrated', False)
-        get_logger().info(f"Keyman integrated: {keyman_integrated}")
+        logger.info(f"Keyman integrated: {keyman_integrated}")
         
         # Check bucket name (supports both 'bucket' and 'container' fields for backwards compatibility)
         bucket_name = provider_config.get('bucket') or provider_config.get('container', '').strip()
-        get_logger().info(f"Bucket name: '{bucket_name}' (from bucket field: {bool(provider_config.get('bucket'))}, from container field: {bool(provider_config.get('container'))})")
+        logger.info(f"Bucket name: '{bucket_name}' (from bucket field: {bool(provider_config.get('bucket'))}, from container field: {bool(provider_config.get('container'))})")
         
         # Check region
         region = provider_config.get('region', '').strip()
-        get_logger().info(f"Region: '{region}'")
+        logger.info(f"Region: '{region}'")
         
         # Validate bucket name and region are configured
         if not bucket_name:
-            get_logger().warning("Backblaze bucket name not configured (missing 'bucket' or 'container' field)")
+            logger.warning("Backblaze bucket name not configured (missing 'bucket' or 'container' field)")
             return False
         
         if not region:
-            get_logger().warning("Backblaze region not configured (missing 'region' field)")
+            logger.warning("Backblaze region not configured (missing 'region' field)")
             return False
         
         # Check credentials (keyman or traditional)
         credentials_configured = False
         if keyman_integrated:
             keyman_service_name = provider_config.get('keyman_service_name', provider_name)
-            get_logger().info(f"Keyman service name: {keyman_service_name}")
+            logger.info(f"Keyman service name: {keyman_service_name}")
             
-            try:
-                credentials_configured = backup_manager.keyman.service_configured(keyman_service_name)
-                get_logger().info(f"Keyman service configured result: {credentials_configured}")
-            except (FileNotFoundError, PermissionError) as e:
-                # Key files don't exist or permission denied - treat as not configured
-                get_logger().info(f"Keyman keys not accessible for {provider_name} (normal for new setup): {e}")
-                credentials_configured = False
-            except Exception as e:
-                get_logger().warning(f"Keyman check failed for {provider_name}: {e}")
-                credentials_configured = False
+            # service_configured never raises - missing or unreadable keys are reported as False
+            credentials_configured = _keyman.service_configured(keyman_service_name)
+            logger.info(f"Keyman service configured result: {credentials_configured}")
         else:
             # Fallback to traditional config-based credentials
             app_key_id = provider_config.get('application_key_id', '').strip()
             app_key = provider_config.get('application_key', '').strip()
-            get_logger().info(f"Fallback check - app_key_id length: {len(app_key_id)}, app_key length: {len(app_key)}")
+            logger.info(f"Fallback check - app_key_id length: {len(app_key_id)}, app_key length: {len(app_key)}")
             credentials_configured = bool(app_key_id and app_key)
-            get_logger().info(f"Fallback configuration result: {credentials_configured}")
+            logger.info(f"Fallback configuration result: {credentials_configured}")
         
         # Configuration is complete only if credentials AND bucket/region are configured
         result = credentials_configured and bool(bucket_name and region)
-        get_logger().info(f"Backblaze configuration complete: {result} (credentials: {credentials_configured}, bucket: {bool(bucket_name)}, region: {bool(region)})")
+        logger.info(f"Backblaze configuration complete: {result} (credentials: {credentials_configured}, bucket: {bool(bucket_name)}, region: {bool(region)})")
         return result
     
     elif provider_name == 'google_cloud_storage':
@@ -171,10 +307,11 @@ def _is_provider_configured(provider_name: str, provider_config: dict) -> bool:
 def get_status():
     """Get backup system status and configuration"""
     try:
-        status = backup_handler.get_system_status()
-        return create_response(True, status)
+        status = _single_flight('status', backup_handler.get_system_status)
+        # Status mixes config, systemd and vault state, so tag it by content - unchanged polls get a 304
+        return create_cached_response(_content_etag(status), lambda: status)
     except Exception as e:
-        get_logger().error(f"Status check failed: {e}")
+        logger.error(f"Status check failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Repository/Provider Routes
@@ -185,7 +322,7 @@ def get_repositories():
         repositories = provider_handler.list_providers()
         return create_response(True, repositories)
     except Exception as e:
-        get_logger().error(f"Repository listing failed: {e}")
+        logger.error(f"Repository listing failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/providers/status', methods=['GET'])
@@ -203,20 +340,12 @@ def get_providers_status():
             is_available = _is_provider_available(provider_name)
             is_configured = _is_provider_configured(provider_name, provider_config)
             
-            # Check keyman integration status - handle errors gracefully
+            # Check keyman integration status (service_configured never raises)
             keyman_integrated = provider_config.get('keyman_integrated', False)
             keyman_configured = False
             if keyman_integrated:
-                try:
-                    keyman_service_name = provider_config.get('keyman_service_name', provider_name)
-                    keyman_configured = backup_manager.keyman.service_configured(keyman_service_name)
-                except (FileNotFoundError, PermissionError) as e:
-                    # Key files don't exist yet - this is normal for new setups
-                    get_logger().info(f"Keyman keys not found for {provider_name} (normal for new setup): {e}")
-                    keyman_configured = False
-                except Exception as e:
-                    get_logger().warning(f"Keyman check failed for {provider_name}: {e}")
-                    keyman_configured = False
+                keyman_service_name = provider_config.get('keyman_service_name', provider_name)
+                keyman_configured = _keyman.service_configured(keyman_service_name)
             
             # Try to actually initialize the provider to see if it works
             is_initialized = False
@@ -238,7 +367,7 @@ def get_providers_status():
                 except Exception as e:
                     is_initialized = False
                     initialization_error = str(e)
-                    get_logger().warning(f"Provider {provider_name} failed to initialize: {e}")
+                    logger.warning(f"Provider {provider_name} failed to initialize: {e}")
             
             provider_status.append({
                 'name': provider_name,
@@ -259,7 +388,7 @@ def get_providers_status():
         
         return create_response(True, {'providers': provider_status})
     except Exception as e:
-        get_logger().error(f"Provider status retrieval failed: {e}")
+        logger.error(f"Provider status retrieval failed: {e}")
         # Even if there's an error, return a basic provider list so UI doesn't break
         try:
             config = config_manager.get_safe_config()
@@ -284,25 +413,66 @@ def get_providers_status():
                 })
             return create_response(True, {'providers': fallback_providers})
         except Exception as fallback_error:
-            get_logger().error(f"Fallback provider status also failed: {fallback_error}")
+            logger.error(f"Fallback provider status also failed: {fallback_error}")
             return create_response(False, error=str(e), status_code=500)
 
 # Backup Operations Routes
+def _run_backup_job(job: dict, backup_type: str, repositories: list):
+    """Run a submitted backup job and record its outcome on the job entry"""
+    try:
+        # Use BackupManager for backup operations
+        job['result'] = backup_manager.create_backup(backup_type, repositories)
+        job['status'] = 'completed'
+    except Exception as e:
+        logger.error(f"Backup job {job['job_id']} failed: {e}")
+        job['error'] = str(e)
+        job['status'] = 'failed'
+    finally:
+        job['end_time'] = create_backup_timestamp()
+
+def _prune_backup_jobs():
+    """Drop the oldest finished jobs once more than _MAX_BACKUP_JOBS are tracked"""
+    excess = len(_backup_jobs) - _MAX_BACKUP_JOBS
+    if excess <= 0:
+        return
+    finished = [job_id for job_id, job in _backup_jobs.items() if job['status'] != 'running']
+    for job_id in finished[:excess]:
+        del _backup_jobs[job_id]
+
 @bp.route('/backup/run', methods=['POST'])
 def run_backup():
-    """Run backup for specified repositories"""
+    """Start a backup for specified repositories in the background and return its job"""
     try:
         data = request.get_json() or {}
         backup_type = data.get('type', 'daily')
         repositories = data.get('repositories', [])
         
-        # Use BackupManager for backup operations
-        result = backup_manager.create_backup(backup_type, repositories)
-        return create_response(True, result)
+        job_id = uuid.uuid4().hex
+        job = {
+            'job_id': job_id,
+            'type': backup_type,
+            'repositories': repositories,
+            'start_time': _request_timestamp(),
+            'status': 'running'
+        }
+        _backup_jobs[job_id] = job
+        _prune_backup_jobs()
+        
+        # The request returns immediately - poll /backup/job/<job_id> for the outcome
+        eventlet.spawn(_run_backup_job, job, backup_type, repositories)
+        return create_response(True, dict(job), status_code=202)
     except Exception as e:
-        get_logger().error(f"Backup execution failed: {e}")
+        logger.error(f"Backup execution failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
+@bp.route('/backup/job/<job_id>', methods=['GET'])
+def get_backup_job(job_id):
+    """Get the status and result of a backup job started by /backup/run"""
+    job = _backup_jobs.get(job_id)
+    if job is None:
+        return create_response(False, error='Backup job not found', status_code=404)
+    return create_response(True, dict(job))
+
 def _parse_backup_output(stdout: str, stderr: str) -> dict:
     """Parse backup output to determine provider success/failure."""
     provider_results = {}
@@ -356,7 +526,6 @@ def _parse_backup_output(stdout: str, stderr: str) -> dict:
 
 def _run_backup_in_background(backup_script, cwd):
     """Run backup script in background - logs results but doesn't return to client"""
-    logger = get_logger()
     logger.info("=== BACKGROUND BACKUP STARTED ===")
     
     try:
@@ -393,7 +562,6 @@ def _run_backup_in_background(backup_script, cwd):
 @bp.route('/sync-now', methods=['POST'])
 def sync_now():
     """Run backup using the installed backup system (Sync Now button) - returns immediately, runs in background"""
-    logger = get_logger()
     logger.info("=== SYNC NOW REQUEST STARTED ===")
     
     try:
@@ -455,7 +623,7 @@ def sync_now():
         logger.info("Backup initiated successfully - running in background")
         return create_response(True, {
             'message': 'Backup initiated and running in the background',
-            'timestamp': create_backup_timestamp(),
+            'timestamp': _request_timestamp(),
             'status': 'initiated'
         })
             
@@ -472,7 +640,7 @@ def test_cloud_connections():
         connections = provider_handler.test_all_providers()
         return create_response(True, {'connections': connections})
     except Exception as e:
-        get_logger().error(f"Cloud connection test failed: {e}")
+        logger.error(f"Cloud connection test failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Configuration Routes
@@ -480,23 +648,26 @@ def test_cloud_connections():
 def get_config():
     """Get backup configuration"""
     try:
-        config = config_manager.get_safe_config()
-        # Ensure state section exists with backup_count
-        if 'state' not in config:
-            config['state'] = {}
-        if 'backup_count' not in config['state']:
-            config['state']['backup_count'] = 0
-        return create_response(True, config)
+        def build_config():
+            config = config_manager.get_safe_config()
+            # Ensure state section exists with backup_count
+            if 'state' not in config:
+                config['state'] = {}
+            if 'backup_count' not in config['state']:
+                config['state']['backup_count'] = 0
+            return config
+        
+        return create_cached_response(_config_etag(), build_config)
     except Exception as e:
-        get_logger().error(f"Config retrieval failed: {e}")
+        logger.error(f"Config retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/config', methods=['POST'])
 def update_config():
     """Update backup configuration"""
     try:
-        data = request.get_json()
-        if not data:
+        data = _get_json_body()
+        if data is None:
             return create_response(False, error='No configuration data provided', status_code=400)
         
         success = config_manager.update_config(data)
@@ -505,7 +676,7 @@ def update_config():
         else:
             return create_response(False, error='Failed to update configuration', status_code=500)
     except Exception as e:
-        get_logger().error(f"Config update failed: {e}")
+        logger.error(f"Config update failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # History Routes
@@ -516,7 +687,30 @@ def get_backup_history():
         history = backup_handler.get_backup_history()
         return create_response(True, history)
     except Exception as e:
-        get_logger().error(f"History retrieval failed: {e}")
+        logger.error(f"History retrieval failed: {e}")
+        return create_response(False, error=str(e), status_code=500)
+
+@bp.route('/history/log', methods=['GET'])
+def stream_backup_log():
+    """Stream the tail of the backup log as newline-delimited JSON strings"""
+    try:
+        count = min(max(request.args.get('lines', 50, type=int), 1), _MAX_LOG_LINES)
+        # The tail is read here, before streaming starts, so a missing or unreadable log gets a proper status
+        try:
+            lines = iter_last_lines(BACKUP_LOG_PATH, count)
+        except FileNotFoundError:
+            return create_response(False, error='Backup log not found', status_code=404)
+        except OSError as e:
+            logger.error(f"Could not read backup log: {e}")
+            return create_response(False, error=f'Could not read backup log: {e}', status_code=500)
+        
+        if orjson is not None:
+            body = (orjson.dumps(line) + b'\n' for line in lines)
+        else:
+            body = (json.dumps(line) + '\n' for line in lines)
+        return current_app.response_class(stream_with_context(body), mimetype='application/x-ndjson')
+    except Exception as e:
+        logger.error(f"Log streaming failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/backup/list/<provider_name>', methods=['GET'])
@@ -526,7 +720,7 @@ def list_backups(provider_name):
         result = backup_manager.list_backups(provider_name)
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Backup listing failed for {provider_name}: {e}")
+        logger.error(f"Backup listing failed for {provider_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Schedule Routes
@@ -537,7 +731,7 @@ def get_schedule():
         schedule = schedule_handler.get_schedule_status()
         return create_response(True, schedule)
     except Exception as e:
-        get_logger().error(f"Schedule retrieval failed: {e}")
+        logger.error(f"Schedule retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/schedule', methods=['POST'])
@@ -558,29 +752,34 @@ def update_schedule():
         result = schedule_handler.update_schedule(action, schedule)
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Schedule update failed: {e}")
+        logger.error(f"Schedule update failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Provider Schema Routes
+# The provider schema is static, so its response body is serialized once
+_SCHEMA_BODY = _prebuild_body(provider_handler.get_provider_schema())
+_SCHEMA_ETAG = _make_etag('schema')
+
 @bp.route('/providers/schema', methods=['GET'])
 def get_provider_schema():
     """Get comprehensive provider configuration schema for all available providers"""
     try:
-        schema = provider_handler.get_provider_schema()
-        return create_response(True, schema)
+        return create_static_response(_SCHEMA_ETAG, _SCHEMA_BODY)
     except Exception as e:
-        get_logger().error(f"Provider schema retrieval failed: {e}")
+        logger.error(f"Provider schema retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Individual Provider Routes
 @bp.route('/providers/<provider_name>/config', methods=['GET'])
 def get_provider_config(provider_name):
     """Get current configuration for a specific provider"""
+    if not config_manager.is_known_provider(provider_name):
+        return create_response(False, error=f'Provider {provider_name} not found', status_code=404)
     try:
         config = provider_handler.get_provider_config(provider_name)
         return create_response(True, config)
     except Exception as e:
-        get_logger().error(f"Provider config retrieval failed for {provider_name}: {e}")
+        logger.error(f"Provider config retrieval failed for {provider_name}: {e}")
         if "not found" in str(e).lower():
             return create_response(False, error=str(e), status_code=404)
         return create_response(False, error=str(e), status_code=500)
@@ -588,11 +787,17 @@ def get_provider_config(provider_name):
 @bp.route('/providers/<provider_name>/config', methods=['POST'])
 def update_provider_config(provider_name):
     """Update configuration for a specific provider"""
+    if not config_manager.is_known_provider(provider_name):
+        return create_response(False, error=f'Provider {provider_name} not found', status_code=404)
     try:
         data = request.get_json()
         if not data:
             return create_response(False, error='No configuration data provided', status_code=400)
         
+        is_valid, errors = config_manager.validate_provider_fields(provider_name, data)
+        if not is_valid:
+            return create_response(False, error='; '.join(errors), status_code=400)
+        
         # Use BackupManager for provider config updates
         success = backup_manager.update_provider_config(provider_name, data)
         if success:
@@ -600,7 +805,7 @@ def update_provider_config(provider_name):
         else:
             return create_response(False, error=f'Failed to update configuration for {provider_name}', status_code=500)
     except Exception as e:
-        get_logger().error(f"Provider config update failed for {provider_name}: {e}")
+        logger.error(f"Provider config update failed for {provider_name}: {e}")
         if "not found" in str(e).lower():
             return create_response(False, error=str(e), status_code=404)
         return create_response(False, error=str(e), status_code=500)
@@ -608,12 +813,14 @@ def update_provider_config(provider_name):
 @bp.route('/providers/<provider_name>/test', methods=['POST'])
 def test_provider_connection(provider_name):
     """Test connection to a specific provider"""
+    if not config_manager.is_known_provider(provider_name):
+        return create_response(False, error=f'Provider {provider_name} not found', status_code=404)
     try:
         # Use BackupManager for testing connections
         result = backup_manager.test_provider_connection(provider_name)
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Provider connection test failed for {provider_name}: {e}")
+        logger.error(f"Provider connection test failed for {provider_name}: {e}")
         if "not found" in str(e).lower():
             return create_response(False, error=str(e), status_code=404)
         return create_response(False, error=str(e), status_code=500)
@@ -626,7 +833,7 @@ def get_provider_info(provider_name):
         info = provider_handler.get_provider_info(provider_name)
         return create_response(True, info)
     except Exception as e:
-        get_logger().error(f"Provider info retrieval failed for {provider_name}: {e}")
+        logger.error(f"Provider info retrieval failed for {provider_name}: {e}")
         if "not found" in str(e).lower():
             return create_response(False, error=str(e), status_code=404)
         return create_response(False, error=str(e), status_code=500)
@@ -689,14 +896,14 @@ def get_backup_statistics():
                         'reused_chunks': 0
                     }
             except Exception as chunk_error:
-                get_logger().warning(f"Failed to get chunk statistics: {chunk_error}")
+                logger.warning(f"Failed to get chunk statistics: {chunk_error}")
                 stats['chunked_backup'] = {'enabled': True, 'error': str(chunk_error)}
         else:
             stats['chunked_backup'] = {'enabled': False}
         
         return create_response(True, stats)
     except Exception as e:
-        get_logger().error(f"Statistics retrieval failed: {e}")
+        logger.error(f"Statistics retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/test/cycle', methods=['POST'])
@@ -709,7 +916,7 @@ def test_backup_cycle():
         result = backup_handler.test_backup_cycle(items)
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Backup cycle test failed: {e}")
+        logger.error(f"Backup cycle test failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/cleanup', methods=['POST'])
@@ -722,7 +929,7 @@ def cleanup_old_backups():
         result = backup_handler.cleanup_old_backups(retention_days)
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Backup cleanup failed: {e}")
+        logger.error(f"Backup cleanup failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/schedule/config', methods=['POST'])
@@ -736,27 +943,33 @@ def set_schedule_config():
         result = schedule_handler.set_schedule_config(data)
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Schedule configuration update failed: {e}")
+        logger.error(f"Schedule configuration update failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/schedule/history', methods=['GET'])
 def get_schedule_history():
     """Get schedule execution history"""
     try:
-        history = schedule_handler.get_schedule_history()
+        history = schedule_handler.get_schedule_history(
+            since=request.args.get('since'),
+            until=request.args.get('until')
+        )
         return create_response(True, history)
     except Exception as e:
-        get_logger().error(f"Schedule history retrieval failed: {e}")
+        logger.error(f"Schedule history retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
+# The schedule templates are static, so their response body is serialized once
+_SCHEDULE_TEMPLATES_BODY = _prebuild_body(schedule_handler.get_available_schedules())
+_SCHEDULE_TEMPLATES_ETAG = _make_etag('schedule_templates')
+
 @bp.route('/schedule/templates', methods=['GET'])
 def get_schedule_templates():
     """Get available schedule templates and options"""
     try:
-        templates = schedule_handler.get_available_schedules()
-        return create_response(True, templates)
+        return create_static_response(_SCHEDULE_TEMPLATES_ETAG, _SCHEDULE_TEMPLATES_BODY)
     except Exception as e:
-        get_logger().error(f"Schedule templates retrieval failed: {e}")
+        logger.error(f"Schedule templates retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/schedule/cron/available', methods=['GET'])
@@ -768,7 +981,7 @@ def get_available_cron_schedules():
         result = service.get_available_schedules()
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Available cron schedules retrieval failed: {e}")
+        logger.error(f"Available cron schedules retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/schedule/test', methods=['POST'])
@@ -778,7 +991,7 @@ def test_schedule():
         result = schedule_handler.test_schedule()
         return create_response(True, result)
     except Exception as e:
-        get_logger().error(f"Schedule test failed: {e}")
+        logger.error(f"Schedule test failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Version and System Info Routes
@@ -790,18 +1003,20 @@ def get_version():
         version_file = os.path.join(os.path.dirname(__file__), '..', 'VERSION')
         version = "1.0.0"  # Default fallback
         
-        if os.path.exists(version_file):
+        try:
             with open(version_file, 'r') as f:
                 version = f.read().strip()
+        except FileNotFoundError:
+            pass
         
         return create_response(True, {
             'version': version,
             'tab_name': 'backupTab',
             'description': 'HOMESERVER Professional Backup System',
-            'last_updated': datetime.now().isoformat()
+            'last_updated': _request_timestamp()
         })
     except Exception as e:
-        get_logger().error(f"Version retrieval failed: {e}")
+        logger.error(f"Version retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/auto-update/status', methods=['GET'])
@@ -819,7 +1034,7 @@ def get_auto_update_status():
             'update_available': config.get('update_available', False)
         })
     except Exception as e:
-        get_logger().error(f"Auto-update status retrieval failed: {e}")
+        logger.error(f"Auto-update status retrieval failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/auto-update/toggle', methods=['POST'])
@@ -835,7 +1050,7 @@ def toggle_auto_update():
         # Update config with auto-update setting
         config = config_manager.get_safe_config()
         config['auto_update_enabled'] = enabled
-        config['last_update_check'] = datetime.now().isoformat()
+        config['last_update_check'] = _request_timestamp()
         
         success = config_manager.update_config(config)
         if not success:
@@ -846,9 +1061,9 @@ def toggle_auto_update():
             try:
                 # This would integrate with the main update system
                 # For now, we'll just log that auto-update was enabled
-                get_logger().info(f"Auto-update enabled for backupTab")
+                logger.info(f"Auto-update enabled for backupTab")
             except Exception as check_error:
-                get_logger().warning(f"Failed to check for updates after enabling auto-update: {check_error}")
+                logger.warning(f"Failed to check for updates after enabling auto-update: {check_error}")
         
         return create_response(True, {
             'enabled': enabled,
@@ -856,7 +1071,7 @@ def toggle_auto_update():
             'message': f'Auto-update {"enabled" if enabled else "disabled"} successfully'
         })
     except Exception as e:
-        get_logger().error(f"Auto-update toggle failed: {e}")
+        logger.error(f"Auto-update toggle failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/auto-update/check', methods=['POST'])
@@ -866,7 +1081,7 @@ def check_for_updates():
         # This would integrate with the main update system
         # For now, we'll simulate a check
         config = config_manager.get_safe_config()
-        config['last_update_check'] = datetime.now().isoformat()
+        config['last_update_check'] = _request_timestamp()
         config['update_available'] = False  # This would be determined by the update system
         
         config_manager.update_config(config)
@@ -878,7 +1093,7 @@ def check_for_updates():
             'message': 'Update check completed'
         })
     except Exception as e:
-        get_logger().error(f"Update check failed: {e}")
+        logger.error(f"Update check failed: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Keyman Integration Routes
@@ -889,64 +1104,65 @@ def get_keyman_services():
         services = backup_manager.get_keyman_services()
         return create_response(True, {'services': services})
     except Exception as e:
-        get_logger().error(f"Error getting keyman services: {e}")
+        logger.error(f"Error getting keyman services: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/keyman/credentials/<service_name>', methods=['GET'])
 def get_keyman_credentials(service_name):
     """Get credentials for a specific keyman service"""
     try:
-        credentials = backup_manager.keyman.get_service_credentials(service_name)
+        credentials = _keyman.get_service_credentials(service_name)
         if credentials:
             return create_response(True, {'credentials': credentials})
         else:
             return create_response(False, error='Service not configured or credentials not available', status_code=404)
     except Exception as e:
-        get_logger().error(f"Error getting credentials for {service_name}: {e}")
+        logger.error(f"Error getting credentials for {service_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/keyman/credentials/<service_name>', methods=['POST'])
 def create_keyman_credentials(service_name):
     """Create credentials for a keyman service"""
     try:
-        get_logger().info(f"Creating keyman credentials for service: {service_name}")
+        logger.info(f"Creating keyman credentials for service: {service_name}")
         
-        data = request.get_json()
-        if not data or 'username' not in data or 'password' not in data:
-            get_logger().warning(f"Missing username or password for {service_name} credential creation")
+        data = _get_json_body('username', 'password')
+        if data is None:
+            logger.warning(f"Missing username or password for {service_name} credential creation")
             return create_response(False, error='Username and password are required', status_code=400)
         
+        username = data['username']
+        password = data['password']
+        
         # Log credential creation attempt (without logging actual credentials)
-        username_length = len(data['username']) if data['username'] else 0
-        password_length = len(data['password']) if data['password'] else 0
-        get_logger().info(f"Attempting to create credentials for {service_name}: username length={username_length}, password length={password_length}")
+        logger.info(f"Attempting to create credentials for {service_name}: username length={len(username or '')}, password length={len(password or '')}")
         
-        success = backup_manager.keyman.create_service_credentials(
+        success = _keyman.create_service_credentials(
             service_name,
-            data['username'],
-            data['password']
+            username,
+            password
         )
         
         if success:
-            get_logger().info(f"Successfully created keyman credentials for {service_name}")
-            return create_response(True, {'message': f'Credentials created for {service_name}'})
+            logger.info(f"Successfully created keyman credentials for {service_name}")
+            return create_response(True, {'message': 'Credentials created', 'service': service_name})
         else:
-            get_logger().error(f"Failed to create keyman credentials for {service_name}")
+            logger.error(f"Failed to create keyman credentials for {service_name}")
             return create_response(False, error=f'Failed to create credentials for {service_name}', status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Error creating credentials for {service_name}: {e}")
+        logger.error(f"Error creating credentials for {service_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/keyman/credentials/<service_name>', methods=['PUT'])
 def update_keyman_credentials(service_name):
     """Update credentials for a keyman service"""
     try:
-        data = request.get_json()
-        if not data or 'password' not in data:
+        data = _get_json_body('password')
+        if data is None:
             return create_response(False, error='Password is required', status_code=400)
         
-        success = backup_manager.keyman.update_service_credentials(
+        success = _keyman.update_service_credentials(
             service_name,
             data['password'],
             data.get('username'),
@@ -954,37 +1170,37 @@ def update_keyman_credentials(service_name):
         )
         
         if success:
-            return create_response(True, {'message': f'Credentials updated for {service_name}'})
+            return create_response(True, {'message': 'Credentials updated', 'service': service_name})
         else:
             return create_response(False, error=f'Failed to update credentials for {service_name}', status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Error updating credentials for {service_name}: {e}")
+        logger.error(f"Error updating credentials for {service_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/keyman/credentials/<service_name>', methods=['DELETE'])
 def delete_keyman_credentials(service_name):
     """Delete credentials for a keyman service"""
     try:
-        success = backup_manager.keyman.delete_service_credentials(service_name)
+        success = _keyman.delete_service_credentials(service_name)
         
         if success:
-            return create_response(True, {'message': f'Credentials deleted for {service_name}'})
+            return create_response(True, {'message': 'Credentials deleted', 'service': service_name})
         else:
             return create_response(False, error=f'Failed to delete credentials for {service_name}', status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Error deleting credentials for {service_name}: {e}")
+        logger.error(f"Error deleting credentials for {service_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/keyman/check/<service_name>', methods=['GET'])
 def check_keyman_service_configured(service_name):
     """Check if a keyman service is configured"""
     try:
-        configured = backup_manager.keyman.service_configured(service_name)
+        configured = _keyman.service_configured(service_name)
         return create_response(True, {'configured': configured})
     except Exception as e:
-        get_logger().error(f"Error checking keyman service {service_name}: {e}")
+        logger.error(f"Error checking keyman service {service_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/keyman/providers', methods=['GET'])
@@ -995,25 +1211,26 @@ def get_keyman_providers():
         config = config_manager.get_safe_config()
         configured_providers = config.get('providers', {})
         
-        for provider_name, provider_config in configured_providers.items():
-            if provider_config.get('keyman_integrated', False):
-                try:
-                    keyman_service_name = provider_config.get('keyman_service_name', provider_name)
-                    is_configured = backup_manager.keyman.service_configured(keyman_service_name)
-                except Exception as e:
-                    get_logger().warning(f"Keyman check failed for {provider_name}: {e}")
-                    is_configured = False
-                
-                providers.append({
-                    'name': provider_name,
-                    'keyman_service_name': keyman_service_name,
-                    'configured': is_configured,
-                    'enabled': provider_config.get('enabled', False)
-                })
+        # Resolve keyman service names up front so the vault is only listed once
+        service_names = {
+            provider_name: provider_config.get('keyman_service_name', provider_name)
+            for provider_name, provider_config in configured_providers.items()
+            if provider_config.get('keyman_integrated', False)
+        }
+        
+        configured_services = _keyman.services_configured(list(service_names.values()))
+        
+        for provider_name, keyman_service_name in service_names.items():
+            providers.append({
+                'name': provider_name,
+                'keyman_service_name': keyman_service_name,
+                'configured': configured_services.get(keyman_service_name, False),
+                'enabled': configured_providers[provider_name].get('enabled', False)
+            })
         
         return create_response(True, {'providers': providers})
     except Exception as e:
-        get_logger().error(f"Error getting keyman providers: {e}")
+        logger.error(f"Error getting keyman providers: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Provider Management Routes using BackupManager
@@ -1023,11 +1240,11 @@ def enable_provider(provider_name):
     try:
         success = backup_manager.enable_provider(provider_name)
         if success:
-            return create_response(True, {'message': f'Provider {provider_name} enabled successfully'})
+            return create_response(True, {'message': 'Provider enabled successfully', 'provider': provider_name})
         else:
             return create_response(False, error=f'Failed to enable provider {provider_name}', status_code=500)
     except Exception as e:
-        get_logger().error(f"Error enabling provider {provider_name}: {e}")
+        logger.error(f"Error enabling provider {provider_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/providers/<provider_name>/disable', methods=['POST'])
@@ -1036,11 +1253,11 @@ def disable_provider(provider_name):
     try:
         success = backup_manager.disable_provider(provider_name)
         if success:
-            return create_response(True, {'message': f'Provider {provider_name} disabled successfully'})
+            return create_response(True, {'message': 'Provider disabled successfully', 'provider': provider_name})
         else:
             return create_response(False, error=f'Failed to disable provider {provider_name}', status_code=500)
     except Exception as e:
-        get_logger().error(f"Error disabling provider {provider_name}: {e}")
+        logger.error(f"Error disabling provider {provider_name}: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 # Debug Routes
@@ -1066,7 +1283,7 @@ def get_debug_status():
             'message': message
         })
     except Exception as e:
-        get_logger().error(f"Error getting debug status: {e}")
+        logger.error(f"Error getting debug status: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/debug/toggle', methods=['POST'])
@@ -1074,52 +1291,71 @@ def toggle_debug():
     """Toggle debug mode by creating/removing /tmp file"""
     try:
         debug_file = '/tmp/backupTab_debug.txt'
-        data = request.get_json()
-        if not data or 'enabled' not in data:
+        data = _get_json_body('enabled')
+        if data is None:
             return create_response(False, error='Missing enabled field', status_code=400)
         
         enabled = bool(data['enabled'])
         
+        # Nothing to do if debug mode is already in the requested state
+        if os.path.exists(debug_file) == enabled:
+            return create_response(True, {
+                'enabled': enabled,
+                'message': 'unchanged'
+            })
+        
         if enabled:
-            # Create debug file with timestamp
+            # Create debug file with timestamp (written to a temp file and renamed into place)
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
             debug_content = f"BackupTab Debug Mode Enabled\nTimestamp: {timestamp}\nStatus: ACTIVE"
             
-            with open(debug_file, 'w') as f:
-                f.write(debug_content)
+            # A unique, exclusively created name so other /tmp users and concurrent workers cannot interfere
+            fd, tmp_file = tempfile.mkstemp(dir='/tmp', prefix='backupTab_debug.')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    f.write(debug_content)
+                # mkstemp creates the file 0600; keep the flag file readable like before
+                os.chmod(tmp_file, 0o644)
+                os.replace(tmp_file, debug_file)
+            except BaseException:
+                try:
+                    os.unlink(tmp_file)
+                except OSError:
+                    pass
+                raise
             
             message = f"Debug mode ENABLED at {timestamp}"
-            get_logger().info(f"DEBUG MODE ENABLED - {message}")
+            logger.info(f"DEBUG MODE ENABLED - {message}")
         else:
             # Remove debug file
-            if os.path.exists(debug_file):
+            try:
                 os.remove(debug_file)
+            except FileNotFoundError:
+                pass
             
             message = "Debug mode DISABLED"
-            get_logger().info(f"DEBUG MODE DISABLED - {message}")
+            logger.info(f"DEBUG MODE DISABLED - {message}")
         
         return create_response(True, {
             'enabled': enabled,
             'message': message
         })
     except Exception as e:
-        get_logger().error(f"Error toggling debug mode: {e}")
+        logger.error(f"Error toggling debug mode: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/key', methods=['POST'])
 def set_backup_key():
     """Set backup encryption key using keyman integration"""
     try:
-        data = request.get_json()
-        if not data or 'password' not in data:
+        password = (_get_json_body() or {}).get('password')
+        if not password:
             return create_response(False, error='Password is required', status_code=400)
-        
-        password = data['password']
         if len(password) < 8:
             return create_response(False, error='Password must be at least 8 characters long', status_code=400)
         
         # Create backup key using keyman integration (same as backupTab2)
-        success = backup_manager.keyman.create_service_credentials(
+        success = _keyman.create_service_credentials(
             'backup',
             'backup',
             password
@@ -1131,179 +1367,177 @@ def set_backup_key():
             return create_response(False, error='Failed to set backup encryption key', status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Error setting backup key: {e}")
+        logger.error(f"Error setting backup key: {e}")
         return create_response(False, error=str(e), status_code=500)
 
-@bp.route('/header-stats', methods=['GET'])
-def get_header_stats():
-    """Get comprehensive header statistics for backup tab"""
+def _build_header_stats() -> dict:
+    """Build comprehensive header statistics for backup tab"""
+    # Load config to get provider and item counts
+    config = config_manager.get_safe_config()
+    
+    # Get backup status from status manager
+    status = backup_handler.get_system_status()
+    
+    # Counts are refreshed by the config manager when the config is loaded
+    enabled_providers = config_manager.enabled_providers_count
+    backup_items_count = config_manager.backup_items_count
+    
+    # Get last backup time
+    last_backup = status.get('last_backup')
+    last_backup_display = last_backup or "Never"
+    
+    # Get next backup time from schedule handler (uses actual cron schedule)
+    next_backup_display = "Not scheduled"
     try:
-        get_logger().info("Header stats endpoint called")
-        
-        # Import datetime for calculations
-        from datetime import datetime, timedelta
-        
-        # Load config to get provider and item counts
-        config = config_manager.get_safe_config()
-        
-        # Get backup status from status manager
-        status = backup_handler.get_system_status()
-        
-        # Count enabled providers
-        enabled_providers = 0
-        if config.get('providers'):
-            enabled_providers = sum(1 for provider in config['providers'].values() 
-                                  if provider.get('enabled', False))
-        
-        # Count backup items
-        backup_items_count = len(config.get('backup_items', []))
-        
-        # Get last backup time
-        last_backup = status.get('last_backup')
-        last_backup_display = last_backup or "Never"
-        
-        # Get next backup time from schedule handler (uses actual cron schedule)
+        schedule_status = schedule_handler.get_schedule_status()
+        if schedule_status and schedule_status.get('next_run'):
+            next_run = schedule_status['next_run']
+            if next_run and next_run != 'Not scheduled':
+                # Format the ISO timestamp to American date format
+                try:
+                    next_run_dt = datetime.fromisoformat(next_run.replace('Z', '+00:00'))
+                    next_backup_display = next_run_dt.strftime('%B %d, %Y %H:%M')
+                except Exception as e:
+                    logger.warning(f"Error formatting next run time: {e}")
+                    next_backup_display = next_run
+    except Exception as e:
+        logger.warning(f"Error getting schedule status: {e}")
         next_backup_display = "Not scheduled"
+    
+    # Get backup size information from settings.json state section
+    backup_size_bytes = None
+    backup_size_display = "Unknown"
+    
+    if last_backup:
+        # Try to get backup size from settings.json state section
         try:
-            schedule_status = schedule_handler.get_schedule_status()
-            if schedule_status and schedule_status.get('next_run'):
-                next_run = schedule_status['next_run']
-                if next_run and next_run != 'Not scheduled':
-                    # Format the ISO timestamp to American date format
-                    try:
-                        next_run_dt = datetime.fromisoformat(next_run.replace('Z', '+00:00'))
-                        next_backup_display = next_run_dt.strftime('%B %d, %Y %H:%M')
-                    except Exception as e:
-                        get_logger().warning(f"Error formatting next run time: {e}")
-                        next_backup_display = next_run
-        except Exception as e:
-            get_logger().warning(f"Error getting schedule status: {e}")
-            next_backup_display = "Not scheduled"
-        
-        # Get backup size information from settings.json state section
-        backup_size_bytes = None
-        backup_size_display = "Unknown"
-        
-        if last_backup:
-            # Try to get backup size from settings.json state section
-            try:
-                config = config_manager.get_safe_config()
-                state = config.get('state', {})
-                backup_size_bytes = state.get('last_backup_size_bytes')
-                backup_size_display = state.get('last_backup_size_display', 'Unknown')
+            config = config_manager.get_safe_config()
+            state = config.get('state', {})
+            backup_size_bytes = state.get('last_backup_size_bytes')
+            backup_size_display = state.get('last_backup_size_display', 'Unknown')
+            
+            # If we got size bytes but no display, format it
+            if backup_size_bytes and isinstance(backup_size_bytes, (int, float)) and backup_size_bytes > 0 and backup_size_display == "Unknown":
+                units = ['B', 'KB', 'MB', 'GB', 'TB']
+                unit_index = 0
+                size_value = float(backup_size_bytes)
                 
-                # If we got size bytes but no display, format it
-                if backup_size_bytes and isinstance(backup_size_bytes, (int, float)) and backup_size_bytes > 0 and backup_size_display == "Unknown":
-                    units = ['B', 'KB', 'MB', 'GB', 'TB']
-                    unit_index = 0
-                    size_value = float(backup_size_bytes)
-                    
-                    while size_value >= 1024 and unit_index < len(units) - 1:
-                        size_value /= 1024
-                        unit_index += 1
-                    
-                    backup_size_display = f"{size_value:.1f} {units[unit_index]}"
-            except Exception as e:
-                get_logger().warning(f"Error getting backup size from state: {e}")
-        
-        # Check if backup system is properly installed
-        def check_backup_installation():
-            """Check if backup system is properly installed"""
-            # Check for config file
-            config_exists = os.path.exists("/var/www/homeserver/premium/backupTab_settings.json")
+                while size_value >= 1024 and unit_index < len(units) - 1:
+                    size_value /= 1024
+                    unit_index += 1
+                
+                backup_size_display = f"{size_value:.1f} {units[unit_index]}"
+        except Exception as e:
+            logger.warning(f"Error getting backup size from state: {e}")
+    
+    # Check if backup system is properly installed
+    def check_backup_installation():
+        """Check if backup system is properly installed"""
+        # Check for config file
+        config_exists = os.path.exists("/var/www/homeserver/premium/backupTab_settings.json")
 
-            # Check for backup CLI script (generated files in /var/www/homeserver/premium/)
-            cli_exists = os.path.exists("/var/www/homeserver/premium/backup")
+        # Check for backup CLI script (generated files in /var/www/homeserver/premium/)
+        cli_exists = os.path.exists("/var/www/homeserver/premium/backup")
 
-            # Check for virtual environment (generated files in /var/www/homeserver/premium/)
-            venv_exists = os.path.exists("/var/www/homeserver/premium/venv")
+        # Check for virtual environment (generated files in /var/www/homeserver/premium/)
+        venv_exists = os.path.exists("/var/www/homeserver/premium/venv")
 
-            # Check for cron job
-            cron_exists = os.path.exists("/etc/cron.d/homeserver-backup")
+        # Check for cron job
+        cron_exists = os.path.exists("/etc/cron.d/homeserver-backup")
 
-            # Check for database file
-            db_exists = os.path.exists("/var/www/homeserver/premium/backupTab_chunks.db")
+        # Check for database file
+        db_exists = os.path.exists("/var/www/homeserver/premium/backupTab_chunks.db")
 
-            # System is considered installed if config exists AND CLI exists AND venv exists AND database exists
-            is_installed = config_exists and cli_exists and venv_exists and db_exists
-            
-            return {
-                "is_installed": is_installed,
-                "config_exists": config_exists,
-                "cli_exists": cli_exists,
-                "venv_exists": venv_exists,
-                "cron_exists": cron_exists,
-                "db_exists": db_exists
-            }
-        
-        installation_check = check_backup_installation()
-        is_configured = installation_check["is_installed"]
-        
-        # Build list of missing components for better diagnostics
-        missing_components = []
-        if not installation_check["config_exists"]:
-            missing_components.append("config")
-        if not installation_check["cli_exists"]:
-            missing_components.append("cli")
-        if not installation_check["venv_exists"]:
-            missing_components.append("venv")
-        if not installation_check["cron_exists"]:
-            missing_components.append("cron")
-        if not installation_check["db_exists"]:
-            missing_components.append("database")
-        
-        # Create proper installation status for UI
-        installation_status = {
-            "installed": is_configured,
-            "installation_timestamp": None,  # Could be enhanced to read from actual installation log
-            "installation_method": "cli" if is_configured else None,
-            "version": "1.0.0",  # Could be enhanced to read from actual version
-            "installation_path": "/var/www/homeserver/premium" if is_configured else None,
-            "missing_components": missing_components,
-            "can_install": not is_configured,
-            "can_uninstall": is_configured
+        # System is considered installed if config exists AND CLI exists AND venv exists AND database exists
+        is_installed = config_exists and cli_exists and venv_exists and db_exists
+        
+        return {
+            "is_installed": is_installed,
+            "config_exists": config_exists,
+            "cli_exists": cli_exists,
+            "venv_exists": venv_exists,
+            "cron_exists": cron_exists,
+            "db_exists": db_exists
         }
+    
+    installation_check = check_backup_installation()
+    is_configured = installation_check["is_installed"]
+    
+    # Build list of missing components for better diagnostics
+    missing_components = []
+    if not installation_check["config_exists"]:
+        missing_components.append("config")
+    if not installation_check["cli_exists"]:
+        missing_components.append("cli")
+    if not installation_check["venv_exists"]:
+        missing_components.append("venv")
+    if not installation_check["cron_exists"]:
+        missing_components.append("cron")
+    if not installation_check["db_exists"]:
+        missing_components.append("database")
+    
+    # Create proper installation status for UI
+    installation_status = {
+        "installed": is_configured,
+        "installation_timestamp": None,  # Could be enhanced to read from actual installation log
+        "installation_method": "cli" if is_configured else None,
+        "version": "1.0.0",  # Could be enhanced to read from actual version
+        "installation_path": "/var/www/homeserver/premium" if is_configured else None,
+        "missing_components": missing_components,
+        "can_install": not is_configured,
+        "can_uninstall": is_configured
+    }
+    
+    # Prepare comprehensive header stats with safe defaults
+    header_stats = {
+        "last_backup": last_backup_display,
+        "last_backup_timestamp": last_backup,
+        "next_backup": next_backup_display,
+        "backup_items_count": backup_items_count,
+        "last_backup_size": backup_size_display,
+        "last_backup_size_bytes": backup_size_bytes if isinstance(backup_size_bytes, (int, float)) else None,
+        "backup_in_progress": False,  # Would need to be implemented
+        "key_exists": status.get('config_exists', False),
+        "is_configured": is_configured,
+        "installation_status": installation_status
+    }
+    
+    logger.info(f"Header stats prepared: {header_stats}")
+    
+    return header_stats
+
+@bp.route('/header-stats', methods=['GET'])
+def get_header_stats():
+    """Get comprehensive header statistics for backup tab"""
+    try:
+        logger.info("Header stats endpoint called")
         
-        # Prepare comprehensive header stats with safe defaults
-        header_stats = {
-            "last_backup": last_backup_display,
-            "last_backup_timestamp": last_backup,
-            "next_backup": next_backup_display,
-            "backup_items_count": backup_items_count,
-            "last_backup_size": backup_size_display,
-            "last_backup_size_bytes": backup_size_bytes if isinstance(backup_size_bytes, (int, float)) else None,
-            "backup_in_progress": False,  # Would need to be implemented
-            "key_exists": status.get('config_exists', False),
-            "is_configured": is_configured,
-            "installation_status": installation_status
-        }
-        
-        get_logger().info(f"Header stats prepared: {header_stats}")
-        
+        # Concurrent page-load requests share a single computation
+        header_stats = _single_flight('header-stats', _build_header_stats)
         return create_response(True, header_stats)
         
     except Exception as e:
-        get_logger().error(f"Error getting header stats: {e}")
+        logger.error(f"Error getting header stats: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/install', methods=['POST'])
 def install_backup_system():
     """Install backup system using CLI installer"""
     try:
-        get_logger().info("Backup system installation requested")
+        logger.info("Backup system installation requested")
         
         # Import the CLI installer
-        get_logger().info("Attempting to import BackupEnvironmentSetup")
+        logger.info("Attempting to import BackupEnvironmentSetup")
         from .src.installer.setupEnvironment import BackupEnvironmentSetup
-        get_logger().info("BackupEnvironmentSetup imported successfully")
+        logger.info("BackupEnvironmentSetup imported successfully")
         
-        get_logger().info("Creating BackupEnvironmentSetup instance")
+        logger.info("Creating BackupEnvironmentSetup instance")
         setup = BackupEnvironmentSetup()
-        get_logger().info("BackupEnvironmentSetup instance created successfully")
+        logger.info("BackupEnvironmentSetup instance created successfully")
         
-        get_logger().info("Starting installation process")
+        logger.info("Starting installation process")
         success = setup.install()
-        get_logger().info(f"Installation process completed with result: {success}")
+        logger.info(f"Installation process completed with result: {success}")
         
         if success:
             return create_response(True, {
@@ -1314,9 +1548,9 @@ def install_backup_system():
             return create_response(False, error='Installation failed', status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Installation failed with exception: {e}")
+        logger.error(f"Installation failed with exception: {e}")
         import traceback
-        get_logger().error(f"Installation traceback: {traceback.format_exc()}")
+        logger.error(f"Installation traceback: {traceback.format_exc()}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/restore', methods=['POST'])
@@ -1355,9 +1589,9 @@ def restore_files():
             return create_response(False, error=result.get('error', 'Restore failed'), status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Restore failed: {e}")
+        logger.error(f"Restore failed: {e}")
         import traceback
-        get_logger().error(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/backups/list', methods=['GET'])
@@ -1394,45 +1628,45 @@ def list_chunked_backups():
             })
         except Exception as db_error:
             # If database cannot be accessed, chunking is not available
-            get_logger().warning(f"Chunk database not accessible: {db_error}")
+            logger.warning(f"Chunk database not accessible: {db_error}")
             return create_response(True, {
                 'backups': [],
                 'chunking_enabled': False
             })
         
     except Exception as e:
-        get_logger().error(f"Failed to list backups: {e}")
+        logger.error(f"Failed to list backups: {e}")
         return create_response(False, error=str(e), status_code=500)
 
 @bp.route('/uninstall', methods=['POST'])
 def uninstall_backup_system():
     """Uninstall backup system using CLI uninstaller"""
     try:
-        get_logger().info("Backup system uninstallation requested")
+        logger.info("Backup system uninstallation requested")
         
         # Import the CLI installer
         from .src.installer.setupEnvironment import BackupEnvironmentSetup
         
-        get_logger().info("BackupEnvironmentSetup imported successfully")
+        logger.info("BackupEnvironmentSetup imported successfully")
         setup = BackupEnvironmentSetup()
-        get_logger().info("BackupEnvironmentSetup instance created")
+        logger.info("BackupEnvironmentSetup instance created")
         
         success = setup.uninstall()
-        get_logger().info(f"Uninstall method completed with result: {success}")
+        logger.info(f"Uninstall method completed with result: {success}")
         
         if success:
-            get_logger().info("Uninstall successful, returning success response")
+            logger.info("Uninstall successful, returning success response")
             return create_response(True, {
                 'message': 'Backup system uninstalled successfully',
                 'installed': False
             })
         else:
-            get_logger().error("Uninstall failed, returning error response")
+            logger.error("Uninstall failed, returning error response")
             return create_response(False, error='Uninstallation failed', status_code=500)
             
     except Exception as e:
-        get_logger().error(f"Uninstallation failed with exception: {e}")
+        logger.error(f"Uninstallation failed with exception: {e}")
         import traceback
-        get_logger().error(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
         return create_response(False, error=str(e), status_code=500)
 
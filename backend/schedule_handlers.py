@@ -4,22 +4,107 @@ HOMESERVER Backup Tab Schedule Handlers
 Handles backup schedule management and cron job operations
 """
 
-import os
-import subprocess
-import yaml
-from datetime import datetime, timedelta
+import re
+import json
+import time
+from collections import deque
+from datetime import datetime
 from typing import Dict, Any, Optional
 import croniter
 from .utils import (
-    BACKUP_CONFIG_PATH,
     get_logger,
-    run_cli_command,
-    validate_file_path
+    create_backup_timestamp,
+    iter_command_output
 )
 from .config_manager import BackupConfigManager
 from .src.service.backup_service import BackupService
 from .src.utils.config_manager import BACKUP_SCRIPT_PATH
 
+# orjson is optional - fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Both parsers accept the raw bytes lines read from journalctl
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Journal entries requested for schedule history and its success rate
+_HISTORY_ENTRY_LIMIT = 200
+
+# Seconds a schedule status snapshot is reused before re-reading cron and config
+SCHEDULE_STATUS_TTL = 1.0
+
+def _daily_cron(hour: int, minute: int, schedule_config: Dict[str, Any]) -> str:
+    """Daily: minute hour * * *"""
+    return f"{minute} {hour} * * *"
+
+def _weekly_cron(hour: int, minute: int, schedule_config: Dict[str, Any]) -> str:
+    """Weekly: minute hour * * dayOfWeek (0=Sunday, 1=Monday, etc.)"""
+    return f"{minute} {hour} * * {schedule_config.get('dayOfWeek', 0)}"
+
+def _monthly_cron(hour: int, minute: int, schedule_config: Dict[str, Any]) -> str:
+    """Monthly: minute hour dayOfMonth * *"""
+    return f"{minute} {hour} {schedule_config.get('dayOfMonth', 1)} * *"
+
+def _custom_cron(hour: int, minute: int, schedule_config: Dict[str, Any]) -> str:
+    """Custom cron expression provided directly"""
+    return schedule_config.get('cron_expression', '0 2 * * *')
+
+# Actions accepted by update_schedule
+_VALID_ACTIONS = frozenset(('enable', 'disable', 'deploy', 'remove'))
+
+# Schedule frequencies accepted by _validate_schedule_config
+_VALID_FREQS = frozenset(('daily', 'weekly', 'monthly', 'custom'))
+
+# Schedule time of day as H:MM or HH:MM on a 24-hour clock
+_TIME_RE = re.compile(r'(?:[01]?\d|2[0-3]):[0-5]?\d')
+
+# Cron expression with exactly five whitespace-separated fields
+_CRON_RE = re.compile(r'\s*\S+(?:\s+\S+){4}\s*')
+
+# Static schedule templates and options served to the frontend (shared - do not modify)
+_AVAILABLE_SCHEDULES = {
+    'frequencies': [
+        {'value': 'daily', 'label': 'Daily', 'description': 'Run backup every day'},
+        {'value': 'weekly', 'label': 'Weekly', 'description': 'Run backup once per week'},
+        {'value': 'monthly', 'label': 'Monthly', 'description': 'Run backup once per month'},
+        {'value': 'custom', 'label': 'Custom Cron', 'description': 'Use custom cron expression'}
+    ],
+    'time_slots': [
+        {'value': '00:00', 'label': 'Midnight'},
+        {'value': '01:00', 'label': '1:00 AM'},
+        {'value': '02:00', 'label': '2:00 AM'},
+        {'value': '03:00', 'label': '3:00 AM'},
+        {'value': '04:00', 'label': '4:00 AM'},
+        {'value': '05:00', 'label': '5:00 AM'},
+        {'value': '06:00', 'label': '6:00 AM'}
+    ],
+    'weekdays': [
+        {'value': '0', 'label': 'Sunday'},
+        {'value': '1', 'label': 'Monday'},
+        {'value': '2', 'label': 'Tuesday'},
+        {'value': '3', 'label': 'Wednesday'},
+        {'value': '4', 'label': 'Thursday'},
+        {'value': '5', 'label': 'Friday'},
+        {'value': '6', 'label': 'Saturday'}
+    ],
+    'cron_examples': {
+        'daily_at_2am': '0 2 * * *',
+        'weekly_monday_3am': '0 3 * * 1',
+        'monthly_first_4am': '0 4 1 * *',
+        'every_6_hours': '0 */6 * * *'
+    }
+}
+
+# Cron expression builders keyed by schedule frequency
+_CRON_BUILDERS = {
+    'daily': _daily_cron,
+    'weekly': _weekly_cron,
+    'monthly': _monthly_cron,
+    'custom': _custom_cron
+}
+
 class ScheduleHandler:
     """Handles backup schedule management using cron jobs"""
     
@@ -27,6 +112,9 @@ class ScheduleHandler:
         self.logger = get_logger()
         self.config_manager = BackupConfigManager()
         self.backup_service = BackupService()
+        self.timer_name = 'homeserver-backup.timer'
+        self._status_cache = None
+        self._status_cache_ts = 0.0
     
     def _calculate_next_run(self, cron_schedule: str) -> Optional[str]:
         """Calculate the next run time for a cron schedule."""
@@ -46,14 +134,28 @@ class ScheduleHandler:
             return None
     
     def get_schedule_status(self) -> Dict[str, Any]:
+        """Get backup schedule configuration and status, reusing a snapshot for SCHEDULE_STATUS_TTL seconds"""
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache_ts < SCHEDULE_STATUS_TTL:
+            return self._status_cache
+        
+        schedule = self._read_schedule_status()
+        self._status_cache = schedule
+        self._status_cache_ts = now
+        return schedule
+    
+    def _invalidate_status_cache(self) -> None:
+        """Force the next get_schedule_status call to re-read cron and config"""
+        self._status_cache_ts = 0.0
+    
+    def _read_schedule_status(self) -> Dict[str, Any]:
         """Get backup schedule configuration and status using cron"""
         try:
             # Get cron status from backup service
             result = self.backup_service.get_cron_status()
             
-            # Get stored schedule configuration from config file
-            config = self.config_manager.get_config()
-            stored_schedule_config = config.get('schedule', {})
+            # Get stored schedule configuration from the cached config snapshot
+            stored_schedule_config = self.config_manager.get_schedule_config()
             
             if result["success"]:
                 status = result["status"]
@@ -130,9 +232,8 @@ class ScheduleHandler:
     def update_schedule(self, action: str, schedule: str = None) -> Dict[str, Any]:
         """Update backup schedule using cron"""
         try:
-            valid_actions = ['enable', 'disable', 'deploy', 'remove']
-            if action not in valid_actions:
-                raise ValueError(f'Unknown action: {action}. Valid actions: {valid_actions}')
+            if action not in _VALID_ACTIONS:
+                raise ValueError(f'Unknown action: {action}. Valid actions: {sorted(_VALID_ACTIONS)}')
             
             if action == 'enable' or action == 'deploy':
                 if not schedule:
@@ -141,6 +242,7 @@ class ScheduleHandler:
                 
                 # Deploy cron schedule
                 result = self.backup_service.deploy_cron_schedule(schedule)
+                self._invalidate_status_cache()
                 
                 if result["success"]:
                     return {
@@ -156,6 +258,7 @@ class ScheduleHandler:
             elif action == 'disable' or action == 'remove':
                 # Remove cron schedule
                 result = self.backup_service.remove_cron_schedule()
+                self._invalidate_status_cache()
                 
                 if result["success"]:
                     return {
@@ -202,19 +305,21 @@ class ScheduleHandler:
                 if not cron_result["success"]:
                     self.logger.warning(f"Failed to remove cron schedule: {cron_result['error']}")
             
+            self._invalidate_status_cache()
+            
             return {
                 'message': 'Schedule configuration updated successfully',
                 'schedule_config': schedule_config,
                 'cron_deployed': schedule_config.get('enabled', False),
-                'updated_at': datetime.now().isoformat()
+                'updated_at': create_backup_timestamp()
             }
         
         except Exception as e:
             self.logger.error(f"Schedule configuration update failed: {e}")
             raise
     
-    def get_schedule_history(self) -> Dict[str, Any]:
-        """Get schedule execution history"""
+    def get_schedule_history(self, since: Optional[str] = None, until: Optional[str] = None) -> Dict[str, Any]:
+        """Get schedule execution history, optionally bounded by journalctl --since/--until"""
         try:
             history = {
                 'recent_executions': [],
@@ -222,40 +327,54 @@ class ScheduleHandler:
                 'success_rate': 0.0
             }
             
-            # Get journalctl output for the timer
+            # Let journalctl pick the newest entries itself; the success rate
+            # is computed over the same window as the recent executions
+            command = [
+                'journalctl', 
+                '-u', self.timer_name,
+                '-n', str(_HISTORY_ENTRY_LIMIT),
+                '--no-pager',
+                '--output=json',
+                '--output-fields=MESSAGE,PRIORITY'
+            ]
+            if since:
+                command.extend(['--since', since])
+            if until:
+                command.extend(['--until', until])
+            
+            # Stream journalctl output line by line instead of buffering it all
             try:
-                result = subprocess.run([
-                    'journalctl', 
-                    '-u', self.timer_name,
-                    '--since', '30 days ago',
-                    '--no-pager',
-                    '-o', 'json'
-                ], capture_output=True, text=True, timeout=30)
+                # Keep only the raw lines of the last 20 executions; the rest are
+                # counted with a byte scan and never decoded
+                recent_lines = deque(maxlen=20)
+                total_executions = 0
+                successful_executions = 0
                 
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split('\n')
-                    executions = []
-                    
-                    for line in lines:
-                        try:
-                            entry = eval(line)  # JSON-like output from journalctl
-                            if 'MESSAGE' in entry:
-                                executions.append({
-                                    'timestamp': entry.get('__REALTIME_TIMESTAMP', ''),
-                                    'message': entry.get('MESSAGE', ''),
-                                    'priority': entry.get('PRIORITY', 0)
-                                })
-                        except Exception:
-                            continue
-                    
-                    history['recent_executions'] = executions[-20:]  # Last 20 executions
+                for raw in iter_command_output(command):
+                    if b'"MESSAGE"' not in raw:
+                        continue
                     
-                    # Calculate success rate
-                    total_executions = len(executions)
-                    successful_executions = len([e for e in executions if 'successfully' in e.get('message', '').lower()])
+                    recent_lines.append(raw)
+                    total_executions += 1
+                    # Matches both "Successfully" and "successfully"
+                    if b'uccessfully' in raw:
+                        successful_executions += 1
+                
+                for raw in recent_lines:
+                    try:
+                        entry = _json_loads(raw)
+                    except ValueError:
+                        continue
                     
-                    if total_executions > 0:
-                        history['success_rate'] = (successful_executions / total_executions) * 100
+                    history['recent_executions'].append({
+                        'timestamp': entry.get('__REALTIME_TIMESTAMP', ''),
+                        'message': entry.get('MESSAGE', ''),
+                        'priority': entry.get('PRIORITY', 0)
+                    })
+                
+                # Calculate success rate
+                if total_executions > 0:
+                    history['success_rate'] = (successful_executions / total_executions) * 100
             
             except Exception as e:
                 self.logger.warning(f"Failed to get schedule history: {e}")
@@ -276,7 +395,7 @@ class ScheduleHandler:
                 return {
                     'message': 'Cron schedule test successful',
                     'status': 'success',
-                    'tested_at': datetime.now().isoformat(),
+                    'tested_at': create_backup_timestamp(),
                     'schedule': test_result.get('schedule'),
                     'backup_script': test_result.get('backup_script'),
                     'template_processed': True
@@ -285,7 +404,7 @@ class ScheduleHandler:
                 return {
                     'message': f'Cron schedule test failed: {test_result["error"]}',
                     'status': 'error',
-                    'tested_at': datetime.now().isoformat()
+                    'tested_at': create_backup_timestamp()
                 }
         
         except Exception as e:
@@ -294,40 +413,19 @@ class ScheduleHandler:
     
     def _validate_schedule_config(self, schedule_config: Dict[str, Any]) -> bool:
         """Validate schedule configuration"""
-        try:
-            # Basic validation
-            required_fields = ['frequency', 'time']
-            for field in required_fields:
-                if field not in schedule_config:
-                    return False
-            
-            # Validate frequency
-            valid_frequencies = ['daily', 'weekly', 'monthly', 'custom']
-            if schedule_config['frequency'] not in valid_frequencies:
-                return False
-            
-            # Validate time format (HH:MM)
-            time_str = schedule_config['time']
-            try:
-                hour, minute = map(int, time_str.split(':'))
-                if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                    return False
-            except ValueError:
-                return False
-            
-            # Validate custom cron expression if frequency is custom
-            if schedule_config['frequency'] == 'custom':
-                if 'cron_expression' not in schedule_config:
-                    return False
-                # Basic cron validation (5 fields)
-                cron_parts = schedule_config['cron_expression'].split()
-                if len(cron_parts) != 5:
-                    return False
-            
-            return True
-        
-        except Exception:
-            return False
+        # Cheapest checks first; the type checks keep malformed JSON from raising
+        frequency = schedule_config.get('frequency')
+        time_str = schedule_config.get('time')
+        cron_expression = schedule_config.get('cron_expression')
+        return (
+            isinstance(frequency, str)
+            and frequency in _VALID_FREQS
+            and isinstance(time_str, str)
+            and _TIME_RE.fullmatch(time_str) is not None
+            and (frequency != 'custom' or (
+                isinstance(cron_expression, str) and _CRON_RE.fullmatch(cron_expression) is not None
+            ))
+        )
     
     def _convert_to_cron_expression(self, schedule_config: Dict[str, Any]) -> str:
         """Convert frontend schedule configuration to cron expression"""
@@ -335,30 +433,15 @@ class ScheduleHandler:
             frequency = schedule_config.get('frequency', 'daily')
             time_str = schedule_config.get('time', '02:00')
             
-            # Parse time
+            # Parse time once and hand it to the builder for this frequency
             hour, minute = map(int, time_str.split(':'))
             
-            if frequency == 'daily':
-                # Daily: minute hour * * *
-                return f"{minute} {hour} * * *"
-            
-            elif frequency == 'weekly':
-                # Weekly: minute hour * * dayOfWeek (0=Sunday, 1=Monday, etc.)
-                day_of_week = schedule_config.get('dayOfWeek', 0)
-                return f"{minute} {hour} * * {day_of_week}"
-            
-            elif frequency == 'monthly':
-                # Monthly: minute hour dayOfMonth * *
-                day_of_month = schedule_config.get('dayOfMonth', 1)
-                return f"{minute} {hour} {day_of_month} * *"
-            
-            elif frequency == 'custom':
-                # Custom cron expression provided directly
-                return schedule_config.get('cron_expression', '0 2 * * *')
-            
-            else:
+            builder = _CRON_BUILDERS.get(frequency)
+            if builder is None:
                 # Default to daily at 2 AM
                 return '0 2 * * *'
+            
+            return builder(hour, minute, schedule_config)
                 
         except Exception as e:
             self.logger.error(f"Failed to convert schedule to cron: {e}")
@@ -366,41 +449,5 @@ class ScheduleHandler:
             return '0 2 * * *'
     
     def get_available_schedules(self) -> Dict[str, Any]:
-        """Get available schedule templates and options"""
-        try:
-            return {
-                'frequencies': [
-                    {'value': 'daily', 'label': 'Daily', 'description': 'Run backup every day'},
-                    {'value': 'weekly', 'label': 'Weekly', 'description': 'Run backup once per week'},
-                    {'value': 'monthly', 'label': 'Monthly', 'description': 'Run backup once per month'},
-                    {'value': 'custom', 'label': 'Custom Cron', 'description': 'Use custom cron expression'}
-                ],
-                'time_slots': [
-                    {'value': '00:00', 'label': 'Midnight'},
-                    {'value': '01:00', 'label': '1:00 AM'},
-                    {'value': '02:00', 'label': '2:00 AM'},
-                    {'value': '03:00', 'label': '3:00 AM'},
-                    {'value': '04:00', 'label': '4:00 AM'},
-                    {'value': '05:00', 'label': '5:00 AM'},
-                    {'value': '06:00', 'label': '6:00 AM'}
-                ],
-                'weekdays': [
-                    {'value': '0', 'label': 'Sunday'},
-                    {'value': '1', 'label': 'Monday'},
-                    {'value': '2', 'label': 'Tuesday'},
-                    {'value': '3', 'label': 'Wednesday'},
-                    {'value': '4', 'label': 'Thursday'},
-                    {'value': '5', 'label': 'Friday'},
-                    {'value': '6', 'label': 'Saturday'}
-                ],
-                'cron_examples': {
-                    'daily_at_2am': '0 2 * * *',
-                    'weekly_monday_3am': '0 3 * * 1',
-                    'monthly_first_4am': '0 4 1 * *',
-                    'every_6_hours': '0 */6 * * *'
-                }
-            }
-        
-        except Exception as e:
-            self.logger.error(f"Failed to get available schedules: {e}")
-            raise
+        """Get available schedule templates and options (shared module constant - do not modify)"""
+        return _AVAILABLE_SCHEDULES
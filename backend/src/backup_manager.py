@@ -7,10 +7,21 @@ Main backup management system with keyman credential integration.
 
 import json
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 from .providers.provider_factory import ProviderFactory
 from .utils.keyman_integration import KeymanIntegration
+from .utils.config_manager import write_file_atomically
+
+# orjson is optional - fall back to the stdlib json module when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Distinguishes "key absent" from a stored None when diffing updates
+_MISSING = object()
 
 class BackupManager:
     """Main backup management system."""
@@ -19,6 +30,8 @@ class BackupManager:
         self.logger = logging.getLogger('backend.backupTab.utils')
         self.keyman = KeymanIntegration()
         self.provider_factory = ProviderFactory()
+        # Serializes config mutations when requests are served from multiple threads
+        self._lock = threading.RLock()
         
         # Load configuration
         if config_path:
@@ -31,8 +44,9 @@ class BackupManager:
     def _load_config(self) -> Dict[str, Any]:
         """Load configuration from JSON file."""
         try:
-            with open(self.config_path, 'r') as f:
-                config = json.load(f)
+            with open(self.config_path, 'rb') as f:
+                raw = f.read()
+            config = orjson.loads(raw) if orjson is not None else json.loads(raw)
             self.logger.info(f"Loaded configuration from {self.config_path}")
             return config
         except Exception as e:
@@ -42,8 +56,12 @@ class BackupManager:
     def save_config(self) -> bool:
         """Save configuration to JSON file."""
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(self.config, f, indent=2)
+            with self._lock:
+                if orjson is not None:
+                    body = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+                else:
+                    body = json.dumps(self.config, indent=2).encode('utf-8')
+                write_file_atomically(self.config_path, body)
             self.logger.info(f"Saved configuration to {self.config_path}")
             return True
         except Exception as e:
@@ -158,27 +176,35 @@ class BackupManager:
     
     def enable_provider(self, provider_name: str) -> bool:
         """Enable a provider."""
-        provider_configs = self.config.get('providers', {})
-        if provider_name in provider_configs:
-            provider_configs[provider_name]['enabled'] = True
-            return self.save_config()
-        return False
+        with self._lock:
+            provider_configs = self.config.get('providers', {})
+            if provider_name in provider_configs:
+                provider_configs[provider_name]['enabled'] = True
+                return self.save_config()
+            return False
     
     def disable_provider(self, provider_name: str) -> bool:
         """Disable a provider."""
-        provider_configs = self.config.get('providers', {})
-        if provider_name in provider_configs:
-            provider_configs[provider_name]['enabled'] = False
-            return self.save_config()
-        return False
+        with self._lock:
+            provider_configs = self.config.get('providers', {})
+            if provider_name in provider_configs:
+                provider_configs[provider_name]['enabled'] = False
+                return self.save_config()
+            return False
     
     def update_provider_config(self, provider_name: str, config_updates: Dict[str, Any]) -> bool:
         """Update provider configuration."""
-        provider_configs = self.config.get('providers', {})
-        if provider_name in provider_configs:
-            provider_configs[provider_name].update(config_updates)
-            return self.save_config()
-        return False
+        with self._lock:
+            provider_configs = self.config.get('providers', {})
+            if provider_name in provider_configs:
+                existing = provider_configs[provider_name]
+                changed = {key: value for key, value in config_updates.items() if existing.get(key, _MISSING) != value}
+                if not changed:
+                    # Nothing differs from what is stored, so skip the file rewrite
+                    return True
+                existing.update(changed)
+                return self.save_config()
+            return False
     
     def get_keyman_services(self) -> List[str]:
         """Get list of keyman-configured services."""
@@ -8,10 +8,78 @@ Deploys and configures the backup service with cron jobs and system integration.
 
 import os
 import sys
+import errno
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+def _kernel_copy(src, dst):
+    """Copy src to dst in-kernel with copy_file_range, falling back to shutil.copy2 where unsupported."""
+    if not hasattr(os, 'copy_file_range'):
+        return shutil.copy2(src, dst)
+    
+    try:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except OSError as e:
+        if e.errno not in (errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP):
+            raise
+        return shutil.copy2(src, dst)
+    
+    shutil.copystat(src, dst)
+    return dst
+
+def _sync_tree(src: str, dst: str):
+    """Mirror src into dst, copying only files whose size or mtime differ and removing stale entries."""
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(dst) as entries:
+        existing = {entry.name: entry for entry in entries}
+    
+    with os.scandir(src) as entries:
+        for entry in entries:
+            dst_path = os.path.join(dst, entry.name)
+            current = existing.pop(entry.name, None)
+            
+            if entry.is_dir():
+                if current is not None and not current.is_dir(follow_symlinks=False):
+                    os.unlink(dst_path)
+                _sync_tree(entry.path, dst_path)
+                continue
+            
+            if current is not None:
+                if current.is_dir(follow_symlinks=False):
+                    shutil.rmtree(dst_path)
+                else:
+                    src_stat = entry.stat()
+                    dst_stat = current.stat(follow_symlinks=False)
+                    # A file still hardlinked to the source (earlier deploys linked them) must be re-copied
+                    # so installed chmods and edits cannot leak back into the checkout
+                    if ((src_stat.st_size, src_stat.st_mtime_ns) == (dst_stat.st_size, dst_stat.st_mtime_ns)
+                            and (src_stat.st_dev, src_stat.st_ino) != (dst_stat.st_dev, dst_stat.st_ino)):
+                        continue
+                    os.unlink(dst_path)
+            
+            _kernel_copy(entry.path, dst_path)
+    
+    for stale in existing.values():
+        if stale.is_dir(follow_symlinks=False):
+            shutil.rmtree(stale.path)
+        else:
+            os.unlink(stale.path)
+
+def _copy_item(source_path: Path, dest_path: Path):
+    """Bring dest_path up to date with the file or directory at source_path."""
+    if source_path.is_dir():
+        _sync_tree(str(source_path), str(dest_path))
+    else:
+        shutil.copy2(source_path, dest_path)
+
 def deploy_backup_service():
     """Deploy the backup service."""
     print("Deploying HOMESERVER Backup Service...")
@@ -32,18 +100,15 @@ def deploy_backup_service():
             "src"
         ]
         
-        for item in files_to_copy:
-            source_path = source_dir / item
-            dest_path = install_dir / item
-            
-            if source_path.is_dir():
-                if dest_path.exists():
-                    shutil.rmtree(dest_path)
-                shutil.copytree(source_path, dest_path)
-            else:
-                shutil.copy2(source_path, dest_path)
-            
-            print(f"Copied {item} to {dest_path}")
+        # The items are independent, so copy them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = {
+                item: executor.submit(_copy_item, source_dir / item, install_dir / item)
+                for item in files_to_copy
+            }
+            for item, future in futures.items():
+                future.result()
+                print(f"Copied {item} to {install_dir / item}")
         
         # Set permissions
         os.chmod(install_dir / "backup", 0o755)
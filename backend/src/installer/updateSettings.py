@@ -54,7 +54,9 @@ class SettingsUpdater:
         try:
             # Create backup of existing file
             if file_path.exists():
-                shutil.copy2(file_path, self.backup_path)
+                # Data and permission bits only - the snapshot holds credentials, so keep its mode
+                shutil.copyfile(file_path, self.backup_path)
+                shutil.copymode(file_path, self.backup_path)
                 self.log(f"Created backup: {self.backup_path}")
             
             # Ensure directory exists
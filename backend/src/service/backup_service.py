@@ -72,16 +72,16 @@ class BackupService:
             success = self.cron_manager.deploy_cron_job(schedule)
             
             if success:
-                # Verify deployment
-                status = self.cron_manager.get_cron_status()
+                # The copy into cron.d is checked, so success means the file now holds this schedule -
+                # no need to read it straight back
                 self.logger.info(f"Cron schedule deployed successfully: {schedule}")
                 
                 return {
                     "success": True,
                     "message": f"Cron schedule deployed: {schedule}",
                     "schedule": schedule,
-                    "cron_file": status["cron_file"],
-                    "enabled": status["enabled"]
+                    "cron_file": str(self.cron_manager.cron_file),
+                    "enabled": True
                 }
             else:
                 return {
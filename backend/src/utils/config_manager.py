@@ -6,7 +6,10 @@ Copyright (C) 2024 HOMESERVER LLC
 Utility for managing backup configuration.
 """
 
+import os
 import json
+import stat
+import tempfile
 from pathlib import Path
 from typing import Dict, Any, Optional
 from .logger import get_logger
@@ -18,6 +21,35 @@ BACKUP_CONFIG_PATH = "/var/www/homeserver/premium/backupTab_settings.json"
 BACKUP_LOG_PATH = "/var/www/homeserver/premium/backupTab.log"
 
 
+def write_file_atomically(path, data: bytes) -> None:
+    """
+    Replace an existing file with data via a sibling temp file and os.replace, keeping its permission bits.
+    Raises FileNotFoundError if the file does not exist. Falls back to rewriting in place when the
+    directory is not writable for the current user.
+    """
+    path = str(path)
+    mode = stat.S_IMODE(os.stat(path).st_mode)
+    tmp_path = None
+    try:
+        # A unique temp name per call, so concurrent writers never share (or rename) each other's file
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix='.tmp'
+        )
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except PermissionError:
+        if tmp_path is not None:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+        with open(path, 'r+b') as f:
+            f.truncate()
+            f.write(data)
+
+
 class ConfigManager:
     """Manages backup configuration operations."""
     
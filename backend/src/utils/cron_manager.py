@@ -7,6 +7,7 @@ Utility for managing backup cron schedules.
 """
 
 import os
+import re
 import subprocess
 import tempfile
 from pathlib import Path
@@ -15,6 +16,8 @@ from datetime import datetime
 from .logger import get_logger
 from .config_manager import BACKUP_SCRIPT_PATH, BACKUP_LOG_PATH
 
+# First uncommented line with five schedule fields followed by a command
+_CRON_LINE_RE = re.compile(r'^[ \t]*([^#\s]\S*(?:[ \t]+\S+){4})[ \t]+\S', re.MULTILINE)
 
 class CronManager:
     """Manages backup cron schedule operations."""
@@ -79,32 +82,41 @@ class CronManager:
             self.logger.error(f"Failed to set backup schedule: {e}")
             return False
     
+    def _read_cron_file(self) -> Optional[str]:
+        """Read the cron file, or None if it does not exist."""
+        # Files in /etc/cron.d are normally world-readable, so only fork sudo when they are not
+        try:
+            with open(self.cron_file, 'r') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except PermissionError:
+            pass
+        
+        result = subprocess.run([
+            '/usr/bin/sudo', '/bin/cat', str(self.cron_file)
+        ], capture_output=True, text=True)
+        return result.stdout if result.returncode == 0 else None
+    
+    def _parse_schedule(self, content: str) -> Optional[str]:
+        """Extract the schedule from the first uncommented cron line (cron + command)."""
+        match = _CRON_LINE_RE.search(content)
+        return ' '.join(match.group(1).split()) if match else None
+    
     def get_schedule(self) -> Optional[str]:
         """Get the current backup cron schedule."""
         try:
-            # Check if cron file exists using /usr/bin/sudo
-            result = subprocess.run([
-                '/usr/bin/sudo', '/bin/cat', str(self.cron_file)
-            ], capture_output=True, text=True)
-            
-            if result.returncode != 0:
+            content = self._read_cron_file()
+            if content is None:
                 self.logger.info("No backup schedule found")
                 return None
             
-            lines = result.stdout.splitlines()
-            
-            # Find the cron line (skip comments)
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    parts = line.split()
-                    if len(parts) >= 6:  # cron + command
-                        schedule = ' '.join(parts[:5])
-                        self.logger.info(f"Current backup schedule: {schedule}")
-                        return schedule
-            
-            self.logger.info("No valid cron schedule found")
-            return None
+            schedule = self._parse_schedule(content)
+            if schedule:
+                self.logger.info(f"Current backup schedule: {schedule}")
+            else:
+                self.logger.info("No valid cron schedule found")
+            return schedule
             
         except Exception as e:
             self.logger.error(f"Failed to get backup schedule: {e}")
@@ -136,20 +148,7 @@ class CronManager:
     
     def is_schedule_enabled(self) -> bool:
         """Check if backup schedule is currently enabled."""
-        try:
-            # Check if cron file exists using /usr/bin/sudo
-            result = subprocess.run([
-                '/usr/bin/sudo', '/bin/cat', str(self.cron_file)
-            ], capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                return False
-            
-            # Also check if there's a valid schedule
-            return self.get_schedule() is not None
-            
-        except Exception:
-            return False
+        return self.get_schedule() is not None
     
     def deploy_cron_job(self, schedule: str) -> bool:
         """Deploy cron job with the specified schedule."""
@@ -161,21 +160,18 @@ class CronManager:
     
     def get_cron_status(self) -> dict:
         """Get comprehensive cron job status."""
-        # Check if cron file exists using /usr/bin/sudo
-        cron_exists = False
+        # Read the cron file once and derive every field from it
         try:
-            result = subprocess.run([
-                '/usr/bin/sudo', '/bin/cat', str(self.cron_file)
-            ], capture_output=True, text=True)
-            cron_exists = result.returncode == 0
+            content = self._read_cron_file()
         except Exception:
-            cron_exists = False
+            content = None
+        schedule = self._parse_schedule(content) if content is not None else None
         
         return {
-            "enabled": self.is_schedule_enabled(),
-            "schedule": self.get_schedule(),
+            "enabled": schedule is not None,
+            "schedule": schedule,
             "cron_file": str(self.cron_file),
-            "exists": cron_exists,
+            "exists": content is not None,
             "template_file": str(self.template_file),
             "template_exists": self.template_file.exists()
         }
@@ -8,7 +8,7 @@ Utilities for integrating with the keyman credential management system.
 import os
 import subprocess
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from pathlib import Path
 
 class KeymanIntegration:
@@ -21,49 +21,62 @@ class KeymanIntegration:
         self.temp_dir = Path('/mnt/keyexchange')
     
     def service_configured(self, service_name: str) -> bool:
-        """Check if a service is configured by looking for its key file."""
-        self.logger.info(f"=== SERVICE_CONFIGURED called for: {service_name} ===")
-        
+        """
+        Check if a service is configured by looking for its key file.
+        Never raises - any failure is treated as not configured.
+        """
         key_file = self.vault_dir / f"{service_name}.key"
-        self.logger.info(f"Looking for key file at: {key_file}")
-        self.logger.info(f"Vault directory: {self.vault_dir}")
-        
-        # Skip vault directory check - not needed and causes permission issues
-        self.logger.info("Skipping vault directory check to avoid permission issues")
         
         try:
             # Use sudo test -f to check file existence (required for permission-restricted files)
-            self.logger.info(f"Executing: sudo test -f {key_file}")
             result = subprocess.run(
                 ['/usr/bin/sudo', 'test', '-f', str(key_file)],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
-            
-            file_exists = result.returncode == 0
-            self.logger.info(f"Key file exists (sudo test): {file_exists}")
-            self.logger.info(f"Sudo test return code: {result.returncode}")
-            
-            if result.returncode != 0:
-                self.logger.info(f"Sudo test failed with return code: {result.returncode}")
-                if result.stderr:
-                    self.logger.info(f"Sudo test stderr: {result.stderr}")
-                if result.stdout:
-                    self.logger.info(f"Sudo test stdout: {result.stdout}")
-            
-            self.logger.info(f"service_configured returning: {file_exists}")
-            return file_exists
-            
         except subprocess.TimeoutExpired:
-            self.logger.error(f"Timeout while checking key file existence for {service_name}")
+            self.logger.warning(f"Timeout while checking key file existence for {service_name}")
             return False
         except Exception as e:
-            self.logger.error(f"Error checking key file existence for {service_name}: {e}")
-            self.logger.error(f"Exception type: {type(e).__name__}")
-            import traceback
-            self.logger.error(f"Traceback: {traceback.format_exc()}")
+            self.logger.warning(f"Error checking key file existence for {service_name}: {e}")
             return False
+        
+        self.logger.debug(f"Key file check for {service_name} at {key_file}: return code {result.returncode}")
+        return result.returncode == 0
+    
+    def services_configured(self, service_names: List[str]) -> Dict[str, bool]:
+        """
+        Check several services at once.
+        Lists the vault key files with a single sudo call instead of one per service.
+        """
+        key_paths = self._list_key_paths()
+        if key_paths is None:
+            # Listing failed - fall back to individual checks
+            return {name: self.service_configured(name) for name in service_names}
+        
+        # Compare full paths so only <vault>/<service>.key counts, exactly like service_configured
+        return {name: str(self.vault_dir / f"{name}.key") in key_paths for name in service_names}
+    
+    def _list_key_paths(self) -> Optional[set]:
+        """Return the paths of the key files directly inside the vault, or None if they cannot be listed."""
+        try:
+            result = subprocess.run(
+                ['/usr/bin/sudo', '/usr/bin/find', str(self.vault_dir), '-maxdepth', '1', '-name', '*.key', '-type', 'f'],
+                capture_output=True,
+                text=True,
+                timeout=10
+            )
+            
+            if result.returncode != 0:
+                self.logger.warning(f"Could not list vault keys: {result.stderr}")
+                return None
+            
+            return {line.strip() for line in result.stdout.splitlines() if line.strip()}
+        
+        except Exception as e:
+            self.logger.error(f"Error listing vault keys: {e}")
+            return None
     
     def get_service_credentials(self, service_name: str) -> Optional[Dict[str, str]]:
         """
@@ -4,20 +4,58 @@ HOMESERVER Backup Tab Backend Utilities
 Shared functions, constants, and helper utilities
 """
 
+import io
 import os
+import re
 import json
+import time
+import shutil
+import tempfile
+import threading
 import subprocess
 import logging
+from functools import lru_cache
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Callable, Iterator, List, Optional
+
+# eventlet is optional - the HOMESERVER app runs on it, standalone use falls back to the stdlib
+try:
+    from eventlet.green.subprocess import Popen as _Popen
+except ImportError:
+    _Popen = subprocess.Popen
+
+# pystemd is optional - it reads unit state over D-Bus in-process, otherwise systemctl is spawned
+try:
+    from pystemd.systemd1 import Unit as _SystemdUnit
+except ImportError:
+    _SystemdUnit = None
 
 # Configuration paths
 # Import centralized paths from config_manager
-from .src.utils.config_manager import BACKUP_CONFIG_PATH, BACKUP_LOG_PATH, BACKUP_BASE_DIR
+from .src.utils.config_manager import BACKUP_CONFIG_PATH, BACKUP_LOG_PATH, BACKUP_BASE_DIR, write_file_atomically
 
 BACKUP_CLI_PATH = BACKUP_BASE_DIR
 
+# Configuration keys whose values are never returned to the client
+SENSITIVE_FIELDS = frozenset(('password', 'application_key', 'secret_key', 'encryption_key', 'encryption_salt'))
+
+# systemctl resolved once at import; /bin is only a compat symlink on merged-/usr systems
+_SYSTEMCTL = shutil.which('systemctl') or '/usr/bin/systemctl'
+
+# Seconds a systemctl is-active result is reused before querying systemd again
+SERVICE_STATUS_TTL = 5.0
+_service_status_cache = {}
+
+# Loaded pystemd Unit proxies, keyed by unit name
+_systemd_units = {}
+
+# Compiled schema validation regexes, keyed by pattern string
+_schema_patterns = {}
+
+# (epoch second, ISO text) of the last timestamp handed out by create_backup_timestamp
+_timestamp_cache = (0, '')
+
 def get_logger():
     """Get logger for backup operations"""
     return logging.getLogger(__name__)
@@ -72,39 +110,112 @@ def check_and_update_config():
         return False
 
 def create_backup_timestamp() -> str:
-    """Create a timestamp string for backup operations"""
-    return datetime.now().isoformat()
+    """Create a timestamp string for backup operations (formatted at most once per second)"""
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, cached_text = _timestamp_cache
+    if now != cached_second:
+        cached_text = datetime.fromtimestamp(now).isoformat()
+        # Replace the whole tuple so concurrent readers never pair a second with another second's text
+        _timestamp_cache = (now, cached_text)
+    return cached_text
 
 
 def redact_sensitive_fields(config: Dict[str, Any]) -> Dict[str, Any]:
     """Redact sensitive fields from configuration"""
-    sensitive_fields = ['password', 'application_key', 'secret_key', 'encryption_key', 'encryption_salt']
-    
     if isinstance(config, dict):
-        redacted_config = config.copy()
-        for field in sensitive_fields:
-            if field in redacted_config and redacted_config[field]:
-                redacted_config[field] = '***REDACTED***'
-        return redacted_config
+        # Build the redacted dict in one pass rather than copying and then overwriting fields
+        return {
+            field: '***REDACTED***' if value and field in SENSITIVE_FIELDS else value
+            for field, value in config.items()
+        }
     
     return config
 
 def run_cli_command(command: list, timeout: int = 60) -> tuple[bool, str, str]:
     """Run a CLI command and return success status, stdout, and stderr"""
     try:
-        result = subprocess.run(
+        # Green Popen yields to other requests while waiting on the CLI instead of blocking the worker
+        process = _Popen(
             command, 
             cwd=BACKUP_CLI_PATH, 
-            capture_output=True, 
-            text=True, 
-            timeout=timeout
+            stdout=subprocess.PIPE, 
+            stderr=subprocess.PIPE
         )
-        return result.returncode == 0, result.stdout, result.stderr
-    except subprocess.TimeoutExpired:
-        return False, "", "Command timed out"
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.communicate()
+            return False, "", "Command timed out"
+        return process.returncode == 0, stdout.decode(errors='replace'), stderr.decode(errors='replace')
+    except Exception as e:
+        return False, "", str(e)
+
+def run_cli_command_until(command: list, stop: Callable[[str], bool], timeout: int = 60) -> tuple[bool, str, str]:
+    """Run a CLI command, streaming its output and terminating it at the first line for which stop(line) is true"""
+    try:
+        # stderr goes to a spool file so it is kept separate yet can never stall the child while stdout is streamed
+        stderr_file = tempfile.TemporaryFile()
+        # Unbuffered so each result line reaches the pipe as it is printed rather than at exit
+        process = _Popen(
+            command, 
+            cwd=BACKUP_CLI_PATH, 
+            stdout=subprocess.PIPE, 
+            stderr=stderr_file,
+            env={**os.environ, 'PYTHONUNBUFFERED': '1'}
+        )
+        timed_out = threading.Event()
+        
+        def on_timeout():
+            timed_out.set()
+            process.kill()
+        
+        watchdog = threading.Timer(timeout, on_timeout)
+        watchdog.start()
+        lines = []
+        stopped = False
+        try:
+            for raw_line in process.stdout:
+                line = raw_line.decode(errors='replace')
+                lines.append(line)
+                if stop(line):
+                    stopped = True
+                    process.terminate()
+                    break
+            process.wait()
+        finally:
+            watchdog.cancel()
+            process.stdout.close()
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors='replace')
+            stderr_file.close()
+        
+        if timed_out.is_set():
+            return False, ''.join(lines), "Command timed out"
+        return stopped or process.returncode == 0, ''.join(lines), stderr
     except Exception as e:
         return False, "", str(e)
 
+def iter_command_output(command: list, timeout: int = 30) -> Iterator[bytes]:
+    """Yield a command's stdout as raw bytes lines, terminating it if the caller stops reading early"""
+    process = _Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    watchdog = threading.Timer(timeout, process.kill)
+    watchdog.start()
+    try:
+        yield from process.stdout
+        process.wait()
+    finally:
+        watchdog.cancel()
+        if process.returncode is None:
+            process.terminate()
+            process.wait()
+        process.stdout.close()
+
+def parse_cli_json(stdout: str) -> Any:
+    """Parse the JSON document printed by a '--format json' CLI command (log output may precede it)"""
+    return json.loads(stdout.strip().rsplit('\n', 1)[-1])
+
 def validate_file_path(path: str) -> bool:
     """Validate that a file path exists and is readable"""
     try:
@@ -112,18 +223,84 @@ def validate_file_path(path: str) -> bool:
     except Exception:
         return False
 
-def get_systemd_service_status(service_name: str) -> str:
-    """Get systemd service status"""
+def _read_tail_text(path: str, count: int, chunk_size: int) -> str:
+    """Read backwards from the end of a file in fixed-size chunks until it holds the last count lines"""
+    with open(path, 'rb') as f:
+        position = f.seek(0, os.SEEK_END)
+        data = b''
+        # One extra newline guarantees the first kept line is complete
+        while position > 0 and data.count(b'\n') <= count:
+            step = min(chunk_size, position)
+            position -= step
+            f.seek(position)
+            data = f.read(step) + data
+    return data.decode('utf-8', errors='replace').strip()
+
+def read_last_lines(path: str, count: int = 50, chunk_size: int = 65536) -> List[str]:
+    """Read the last lines of a file by seeking backwards from the end in fixed-size chunks"""
+    return _read_tail_text(path, count, chunk_size).split('\n')[-count:]
+
+def iter_last_lines(path: str, count: int = 50, chunk_size: int = 65536) -> Iterator[str]:
+    """
+    Read the tail of a file now and return an iterator over its last lines, without building a list of them.
+    The file is read eagerly so a missing or unreadable file raises here rather than on the first next().
+    """
+    return _iter_tail_lines(_read_tail_text(path, count, chunk_size), count)
+
+def _iter_tail_lines(text: str, count: int) -> Iterator[str]:
+    """Yield the last count lines of text one at a time"""
+    start = len(text)
+    for _ in range(count):
+        start = text.rfind('\n', 0, start)
+        if start < 0:
+            break
+    for line in io.StringIO(text[start + 1:]):
+        yield line.rstrip('\n')
+
+def _get_unit_active_state(service_name: str) -> Optional[str]:
+    """Read a unit's state over D-Bus via pystemd, or None when pystemd is unavailable or fails"""
+    if _SystemdUnit is None:
+        return None
     try:
-        result = subprocess.run(
-            ['/bin/systemctl', 'is-active', service_name], 
-            capture_output=True, 
-            text=True, 
-            timeout=10
-        )
-        return result.stdout.strip() if result.returncode == 0 else 'unknown'
+        unit = _systemd_units.get(service_name)
+        if unit is None:
+            unit = _SystemdUnit(service_name.encode())
+            unit.load()
+            _systemd_units[service_name] = unit
+        state = unit.Unit.ActiveState.decode()
+        # Match systemctl is-active, which only succeeds for running units
+        return state if state in ('active', 'reloading') else 'unknown'
     except Exception:
-        return 'unknown'
+        return None
+
+def get_systemd_service_status(service_name: str) -> str:
+    """Get systemd service status (cached briefly - unit state rarely changes between polls)"""
+    cached = _service_status_cache.get(service_name)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < SERVICE_STATUS_TTL:
+        return cached[1]
+    
+    status = _get_unit_active_state(service_name)
+    if status is None:
+        # Green Popen so a slow systemctl never stalls the other requests on this worker
+        try:
+            process = _Popen(
+                [_SYSTEMCTL, 'is-active', service_name], 
+                stdout=subprocess.PIPE, 
+                stderr=subprocess.DEVNULL
+            )
+            try:
+                stdout, _ = process.communicate(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.communicate()
+                raise
+            status = stdout.decode(errors='replace').strip() if process.returncode == 0 else 'unknown'
+        except Exception:
+            status = 'unknown'
+    
+    _service_status_cache[service_name] = (now, status)
+    return status
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
@@ -159,16 +336,22 @@ def parse_backup_output(output: str) -> Dict[str, Any]:
     
     return parsed
 
+@lru_cache(maxsize=32)
+def _provider_status_regex(provider_name: str) -> re.Pattern:
+    """Regex finding the first ✓/✗ mark on a line that mentions the provider"""
+    return re.compile(rf'^(?=[^\n]*{re.escape(provider_name)})[^\n]*?([✓✗])', re.MULTILINE)
+
 def get_provider_status_from_output(output: str, provider_name: str) -> Optional[bool]:
     """Extract provider status from CLI output"""
-    lines = output.strip().split('\n')
-    for line in lines:
-        if provider_name in line:
-            if '✓' in line:
-                return True
-            elif '✗' in line:
-                return False
-    return None
+    match = _provider_status_regex(provider_name).search(output)
+    return match.group(1) == '✓' if match else None
+
+def compile_schema_pattern(pattern: str) -> re.Pattern:
+    """Return the compiled regex for a schema validation pattern, compiling it only the first time"""
+    compiled = _schema_patterns.get(pattern)
+    if compiled is None:
+        compiled = _schema_patterns[pattern] = re.compile(pattern)
+    return compiled
 
 def validate_config_schema(config: Dict[str, Any], schema: Dict[str, Any]) -> tuple[bool, list]:
     """Validate configuration against schema"""
@@ -206,8 +389,7 @@ def validate_config_schema(config: Dict[str, Any], schema: Dict[str, Any]) -> tu
             if 'min_items' in validation and len(value) < validation['min_items']:
                 errors.append(f"Field '{field_name}' must have at least {validation['min_items']} items")
             if 'pattern' in validation:
-                import re
-                if not re.match(validation['pattern'], str(value)):
+                if not compile_schema_pattern(validation['pattern']).match(str(value)):
                     message = validation.get('message', f"Field '{field_name}' format is invalid")
                     errors.append(message)
     
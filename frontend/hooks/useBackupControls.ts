@@ -94,6 +94,10 @@ export function useBackupControls(): UseBackupControlsReturn {
     });
   }, [handleApiCall]);
 
+  const getBackupJob = useCallback(async (jobId: string): Promise<BackupOperation> => {
+    return handleApiCall<BackupOperation>(`/backup/job/${jobId}`);
+  }, [handleApiCall]);
+
   const syncNow = useCallback(async (): Promise<any> => {
     console.log('=== useBackupControls.syncNow() CALLED ===');
     console.log('Making API call to /sync-now with POST method');
@@ -277,6 +281,7 @@ export function useBackupControls(): UseBackupControlsReturn {
     getStatus,
     getRepositories,
     runBackup,
+    getBackupJob,
     syncNow,
     testCloudConnections,
     getConfig,
@@ -243,6 +243,7 @@ export interface BackupScheduleConfig {
 }
 
 export interface BackupOperation {
+  job_id: string;
   type: 'daily' | 'weekly' | 'monthly' | 'yearly';
   repositories: string[];
   start_time: string;
@@ -250,6 +251,7 @@ export interface BackupOperation {
   status: 'running' | 'completed' | 'failed';
   progress?: number;
   output?: string;
+  result?: Record<string, any>;
   error?: string;
 }
 
@@ -294,6 +296,7 @@ export interface UseBackupControlsReturn {
   getStatus: () => Promise<BackupStatus>;
   getRepositories: () => Promise<Repository[]>;
   runBackup: (type: string, repositories: string[]) => Promise<BackupOperation>;
+  getBackupJob: (jobId: string) => Promise<BackupOperation>;
   syncNow: () => Promise<any>;
   testCloudConnections: () => Promise<CloudTestResult>;
   getConfig: () => Promise<BackupConfig>;